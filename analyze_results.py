@@ -1,22 +1,63 @@
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 
 RESULTS_DIR = "/Users/kshamawari/Downloads/tar2/test_results"
 
+# Compiled once at import — analyze_file runs these per section of every file
+_SEP_RE = re.compile(r'-{60,}\s*$')
+# One pass over the header picks up "expect <code>" and every login-test marker
+_CLASSIFY_RE = re.compile(r'(?i:expect)\s+(\d+)|LOGIN_REQUIRED|ECARD|STATUS_CHECK|unauth')
+# Leading literal lets SRE memchr straight to candidates; line-start is checked in _find_status
+_STATUS_RE = re.compile(r'Status :\s*(\d+)')
+
+
+def _find_status(section):
+    """Return the status code from the first line starting with "Status :", or None."""
+    for m in _STATUS_RE.finditer(section):
+        line_start = section.rfind('\n', 0, m.start()) + 1
+        if not section[line_start:m.start()].strip():
+            return int(m.group(1))
+    return None
+
+
+def iter_sections(f):
+    """Yield the text between separator lines one section at a time.
+
+    Only the section being built is held in memory, so large result files
+    are never read in full.
+    """
+    buf = []
+    for line in f:
+        if _SEP_RE.match(line):
+            if buf:
+                yield ''.join(buf)
+                buf.clear()
+        else:
+            buf.append(line)
+    if buf:
+        yield ''.join(buf)
+
+
 def analyze_file(filepath):
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
+    """Analyze one result file.
 
+    Returns (total, passed, failed, output) — output is the report text,
+    buffered so files analyzed in parallel still print in order.
+    """
     filename = os.path.basename(filepath)
-    print(f"Analyzing {filename}...")
+    out = [f"Analyzing {filename}..."]
 
+    with open(filepath, 'r', encoding='utf-8') as f:
+        total, passed, failed = _analyze_sections(iter_sections(f), out)
+    return total, passed, failed, "\n".join(out) + "\n"
+
+
+def _analyze_sections(sections, out):
     # Pattern to find test blocks
     # [TEST 1/15: ...] or [TEST 1: ...] or [QUERY 1: ...] or [SETUP: ...] or [CREATE THREAD]
     # We look for lines starting with dashed lines, then a header like [X]
     
-    # We'll split by separator lines
-    sections = re.split(r'-{60,}', content)
-    
     total = 0
     passed = 0
     failed = 0
@@ -26,42 +67,39 @@ def analyze_file(filepath):
         if not section:
             continue
             
-        lines = section.split('\n')
-        header = lines[0].strip()
+        header = section.partition('\n')[0].strip()
         
         # Check if it's a test block
         if not (header.startswith('[') and header.endswith(']')):
             continue
             
+        # Classify the header in a single regex scan
+        expect_code = None
+        markers = set()
+        for m in _CLASSIFY_RE.finditer(header):
+            if m.lastindex:
+                if expect_code is None:
+                    expect_code = int(m.group(1))
+            else:
+                markers.add(m.group(0))
+        has_unauth = "unauth" in markers
+        has_login = "LOGIN_REQUIRED" in markers
+        has_ecard_or_status = "ECARD" in markers or "STATUS_CHECK" in markers
+
         # Determine expected status
         expected_status = 201 # Default for message posts
         if "GET" in header or "Health" in header or "STREAM" in header:
             expected_status = 200
         
-        # Look for "expect <code" in header
-        match_expect = re.search(r'expect\s+(\d+)', header, re.IGNORECASE)
-        if match_expect:
-            expected_status = int(match_expect.group(1))
-        elif "unauth" in header and "LOGIN_REQUIRED" in header:
+        # "expect <code>" in header wins
+        if expect_code is not None:
+            expected_status = expect_code
+        elif has_unauth and (has_login or has_ecard_or_status):
              expected_status = 201 # The status is 201 but body has LOGIN_REQUIRED
-        elif "ECARD" in header and "unauth" in header:
-             expected_status = 201
-        elif "STATUS_CHECK" in header and "unauth" in header:
-             expected_status = 201
              
         # Extract actual status
-        actual_status = None
-        response_body = ""
-        for line in lines:
-            if line.strip().startswith("Status :"):
-                try:
-                    actual_status = int(line.split(':')[1].strip())
-                except:
-                    pass
-            if "Response:" in line:
-                # Naive capture of response, actually we just need to detect specific strings for some tests
-                pass
-        
+        actual_status = _find_status(section)
+
         if actual_status is None:
             # Maybe a setup block without status or just noise
             continue
@@ -69,20 +107,20 @@ def analyze_file(filepath):
         total += 1
         
         # Special handling for "LOGIN_REQUIRED" tests which return 201 but with specific body
-        is_login_test = "LOGIN_REQUIRED" in header or ("unauth" in header and ("ECARD" in header or "STATUS_CHECK" in header))
+        is_login_test = has_login or (has_unauth and has_ecard_or_status)
         
         if is_login_test:
             if actual_status == 201 and "<<LOGIN_MODAL_REQUIRED>>" in section:
                 passed += 1
             else:
-                print(f"  FAIL: {header}")
-                print(f"    Expected 201 with LOGIN_REQUIRED, got {actual_status}")
+                out.append(f"  FAIL: {header}")
+                out.append(f"    Expected 201 with LOGIN_REQUIRED, got {actual_status}")
                 failed += 1
         elif actual_status == expected_status:
             passed += 1
         else:
-            print(f"  FAIL: {header}")
-            print(f"    Expected {expected_status}, got {actual_status}")
+            out.append(f"  FAIL: {header}")
+            out.append(f"    Expected {expected_status}, got {actual_status}")
             failed += 1
 
     return total, passed, failed
@@ -96,8 +134,14 @@ def main():
     
     print(f"Found {len(files)} result files.")
     
-    for f in sorted(files):
-        t, p, fl = analyze_file(os.path.join(RESULTS_DIR, f))
+    files = sorted(files)
+    paths = [os.path.join(RESULTS_DIR, f) for f in files]
+    # Files are independent and the work is CPU-bound regex, so fan out across processes
+    with ProcessPoolExecutor() as ex:
+        results = list(ex.map(analyze_file, paths))
+
+    for f, (t, p, fl, output) in zip(files, results, strict=True):
+        print(output, end="")
         grand_total += t
         grand_passed += p
         grand_failed += fl
@@ -1,73 +1,200 @@
 import logging
+import re
+from collections.abc import Iterable, Iterator
 
-from langchain_text_splitters import (
-    MarkdownHeaderTextSplitter,
-    RecursiveCharacterTextSplitter,
-)
+from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
-headers = [
-    ("#", "section"),
-    ("##", "scheme"),
-    ("###", "subsection"),
-]
-
-md_splitter = MarkdownHeaderTextSplitter(headers_to_split_on=headers)
-size_splitter = RecursiveCharacterTextSplitter(
-    chunk_size=settings.CHUNK_SIZE,
-    chunk_overlap=settings.CHUNK_OVERLAP,
-    separators=["\n\n", "\n", ". ", " ", ""],
-)
-
-
-def chunk_markdown(text: str) -> list[str]:
-    try:
-        docs = md_splitter.split_text(text)
-    except Exception:
-        logger.error("Failed to split markdown text (len=%d)", len(text), exc_info=True)
-        raise
-    logger.info("Split markdown into %d raw document sections", len(docs))
-
-    chunks: list[str] = []
-    for d in docs:
-        metadata = d.metadata
-        content = d.page_content
-
-        # Build context string from metadata
-        context_parts: list[str] = []
-        if "section" in metadata:
-            context_parts.append(f"Section: {metadata['section']}")
-        if "scheme" in metadata:
-            context_parts.append(f"Scheme: {metadata['scheme']}")
-        if "subsection" in metadata:
-            context_parts.append(f"Subsection: {metadata['subsection']}")
-
-        if context_parts:
-            full_content = "\n".join(context_parts) + "\n\n" + content
-        else:
-            full_content = content
-
-        # If this chunk is too large, sub-split it
-        if len(full_content) > settings.CHUNK_SIZE:
-            sub_chunks = size_splitter.split_text(full_content)
-            logger.debug(
-                "Sub-split oversized chunk (%d chars) into %d pieces",
-                len(full_content),
-                len(sub_chunks),
-            )
-            # Prepend metadata context to each sub-chunk so retrieval
-            # still knows which section/scheme the text belongs to
-            prefix = "\n".join(context_parts) + "\n\n" if context_parts else ""
-            for sc in sub_chunks:
-                if not sc.startswith(prefix.strip()):
-                    chunks.append(prefix + sc)
-                else:
-                    chunks.append(sc)
+# Markdown header level -> metadata key
+headers = {
+    1: "section",
+    2: "scheme",
+    3: "subsection",
+}
+
+# Matches a header line ("#"-"###" followed by a space or end of line) or a
+# code-fence line. Replaces langchain's MarkdownHeaderTextSplitter, which
+# strips and compares each line in Python.
+_HEADER_RE = re.compile(r"^ *(?:(#{1,3})(?: (.*))?|(```|~~~).*)$", re.MULTILINE)
+_LINE_EDGE_RE = re.compile(r" *\n *")
+_PARAGRAPH_BREAK_RE = re.compile(r"\n\n+")
+
+# Built on first use — most sections fit within CHUNK_SIZE and never need it
+_size_splitter: RecursiveCharacterTextSplitter | None = None
+
+
+def _get_size_splitter() -> RecursiveCharacterTextSplitter:
+    global _size_splitter
+    if _size_splitter is None:
+        _size_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=settings.CHUNK_SIZE,
+            chunk_overlap=settings.CHUNK_OVERLAP,
+            separators=["\n\n", "\n", ". ", " ", ""],
+        )
+    return _size_splitter
+
+
+class _NonPrintableFilter(dict):
+    """str.translate table that drops non-printable characters except newline.
+
+    Entries are filled in on first sight of each code point, so translate
+    runs at C speed once the table is warm.
+    """
+
+    def __missing__(self, codepoint: int) -> int | None:
+        char = chr(codepoint)
+        value = codepoint if char == "\n" or char.isprintable() else None
+        self[codepoint] = value
+        return value
+
+
+_non_printable_filter = _NonPrintableFilter()
+
+
+def _strip_non_printable(text: str) -> str:
+    if text.replace("\n", "").isprintable():
+        return text
+    return text.translate(_non_printable_filter)
+
+
+def _iter_fenced_lines(lines: Iterable[str]) -> Iterator[tuple[str, bool]]:
+    """Yield (line, in_fence) pairs, tracking ``` and ~~~ code fences.
+
+    in_fence is true from an opening fence line up to the line before its
+    closing fence.
+    """
+    in_fence = False
+    opening_fence = ""
+    for line in lines:
+        stripped = line.strip()
+        if not in_fence:
+            if stripped.startswith("```") and stripped.count("```") == 1:
+                in_fence, opening_fence = True, "```"
+            elif stripped.startswith("~~~"):
+                in_fence, opening_fence = True, "~~~"
+        elif stripped.startswith(opening_fence):
+            in_fence = False
+        yield line, in_fence
+
+
+def _normalize_body(body: str) -> str:
+    """Strip every line and join paragraphs with "  \\n", like langchain."""
+    if "```" not in body and "~~~" not in body:
+        # Substring checks run at C speed and skip the regex when no line
+        # has edge spaces or no blank line separates paragraphs
+        body = body.strip()
+        if " \n" in body or "\n " in body:
+            body = _LINE_EDGE_RE.sub("\n", body)
+        if "\n\n" in body:
+            body = _PARAGRAPH_BREAK_RE.sub("  \n", body)
+        return body
+
+    # Fenced code keeps its blank lines, so fall back to a line walk
+    paragraphs: list[str] = []
+    current: list[str] = []
+    for line, in_fence in _iter_fenced_lines(body.split("\n")):
+        stripped = line.strip()
+        if in_fence or stripped:
+            current.append(stripped)
+        elif current:
+            paragraphs.append("\n".join(current))
+            current = []
+    if current:
+        paragraphs.append("\n".join(current))
+    return "  \n".join(paragraphs)
+
+
+def iter_markdown_sections(
+    lines: Iterable[str],
+) -> Iterator[tuple[dict[str, str], str]]:
+    """Split markdown on "#", "##" and "###" headers into (metadata, content) pairs.
+
+    Content and metadata match langchain's MarkdownHeaderTextSplitter with
+    its default options. Reads newline-terminated lines (e.g. an open file)
+    and holds only the section being built, plus the last one in case the
+    next must merge into it.
+    """
+    metadata: dict[str, str] = {}
+    body: list[str] = []
+    pending: tuple[dict[str, str], str] | None = None
+
+    printable_lines = (_strip_non_printable(line) for line in lines)
+    for line, in_fence in _iter_fenced_lines(printable_lines):
+        m = None if in_fence else _HEADER_RE.match(line.rstrip("\n"))
+        if m is None or m.group(3) is not None:
+            body.append(line)
+            continue
+
+        content = _normalize_body("".join(body))
+        body = []
+        if content:
+            if pending is not None and pending[0] == metadata:
+                pending = (metadata, pending[1] + "  \n" + content)
+            else:
+                if pending is not None:
+                    yield pending
+                pending = (metadata, content)
+
+        level = len(m.group(1))
+        metadata = {
+            name: value for lvl, name in headers.items()
+            if lvl < level and (value := metadata.get(name)) is not None
+        }
+        metadata[headers[level]] = (m.group(2) or "").strip()
+
+    content = _normalize_body("".join(body))
+    if content:
+        if pending is not None and pending[0] == metadata:
+            pending = (metadata, pending[1] + "  \n" + content)
         else:
-            chunks.append(full_content)
+            if pending is not None:
+                yield pending
+            pending = (metadata, content)
+    if pending is not None:
+        yield pending
+
+
+def iter_chunks(path: str) -> Iterator[str]:
+    """Yield the chunks of the markdown file at path as it is read.
+
+    Neither the whole file nor the chunk list is held in memory.
+    """
+    count = 0
+    with open(path, "r", encoding="utf-8") as f:
+        for metadata, content in iter_markdown_sections(f):
+            for chunk in _section_chunks(metadata, content):
+                count += 1
+                yield chunk
+    logger.info("Produced %d chunks from %s", count, path)
+
+
+def _section_chunks(metadata: dict[str, str], content: str) -> list[str]:
+    """Prefix one section with its metadata, sub-splitting it if oversized."""
+    # Build context lines from metadata (each already newline-terminated)
+    context_parts: list[str] = []
+    if "section" in metadata:
+        context_parts.append(f"Section: {metadata['section']}\n")
+    if "scheme" in metadata:
+        context_parts.append(f"Scheme: {metadata['scheme']}\n")
+    if "subsection" in metadata:
+        context_parts.append(f"Subsection: {metadata['subsection']}\n")
+
+    prefix = "".join([*context_parts, "\n"]) if context_parts else ""
+    full_len = len(prefix) + len(content)
 
-    logger.info("Produced %d chunks with metadata context (size-limited)", len(chunks))
-    return chunks
+    # If this chunk is too large, sub-split the raw content (without the
+    # metadata header) and prepend the header to every piece so retrieval
+    # still knows which section/scheme the text belongs to. The combined
+    # string is only built when it is emitted as-is.
+    if full_len > settings.CHUNK_SIZE:
+        sub_chunks = _get_size_splitter().split_text(content)
+        logger.debug(
+            "Sub-split oversized chunk (%d chars) into %d pieces",
+            full_len,
+            len(sub_chunks),
+        )
+        return [prefix + sc for sc in sub_chunks]
+    return [prefix + content]
@@ -1,26 +1,217 @@
-import json
+import asyncio
 import logging
+import os
+import queue
 import sqlite3
+import threading
 import time
 import uuid
+from pathlib import Path
 
 import aiosqlite
+import orjson
 
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Group-commit limits for MessageWriter and busy-retry count for batch inserts
+_WRITE_BATCH_MAX = 256
+_BUSY_RETRIES = 3
+# Rows pulled per thread hop when reading an unbounded result set
+_FETCH_BATCH_SIZE = 1000
+
+# sqlite3's per-connection statement cache is keyed by the SQL text, so every
+# query lives here as one constant and the cache is sized above the default.
+# Every connection (main and pooled) comes from get_db and gets the same
+# cache, so hot statements are prepared once per connection and reused.
+# Reads go through execute_fetchall: one aiosqlite thread hop per query
+# instead of one for execute and another for the fetch.
+_STATEMENT_CACHE_SIZE = 256
+
+# Run as one script so a new connection is configured in a single call
+_SQL_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA foreign_keys=ON;
+    PRAGMA busy_timeout=5000;
+    -- WAL + NORMAL fsyncs only at checkpoints; 64 MB page cache and 256 MB
+    -- mmap keep hot pages out of read() syscalls
+    PRAGMA synchronous=NORMAL;
+    PRAGMA cache_size=-64000;
+    PRAGMA mmap_size=268435456;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA wal_autocheckpoint=1000;
+"""
+
+# messages is clustered on (thread_id, created_at_ms, id): a thread's history
+# is one contiguous range of the table's own B-tree, already in order. There
+# is no foreign key to threads; the insert paths create the thread row in the
+# same transaction instead of paying an FK probe per message.
+_MESSAGES_TABLE_COLUMNS = """(
+        id BLOB NOT NULL,
+        thread_id TEXT NOT NULL,
+        role TEXT NOT NULL CHECK (role IN ('user', 'assistant')),
+        content TEXT NOT NULL,
+        user_id TEXT NOT NULL DEFAULT '',
+        language TEXT NOT NULL DEFAULT '',
+        created_at TEXT NOT NULL DEFAULT (datetime('now')),
+        created_at_ms INTEGER NOT NULL
+            DEFAULT (CAST(round((julianday('now') - 2440587.5) * 86400000) AS INTEGER)),
+        PRIMARY KEY (thread_id, created_at_ms, id)
+    ) WITHOUT ROWID"""
+
+_SQL_SCHEMA = f"""
+    CREATE TABLE IF NOT EXISTS threads (
+        id TEXT PRIMARY KEY,
+        created_at TEXT NOT NULL DEFAULT (datetime('now'))
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS messages {_MESSAGES_TABLE_COLUMNS};
+
+    CREATE TABLE IF NOT EXISTS user_data_cache (
+        id TEXT PRIMARY KEY,
+        thread_id TEXT NOT NULL,
+        user_id TEXT NOT NULL,
+        data_json TEXT NOT NULL,
+        created_at TEXT NOT NULL DEFAULT (datetime('now')),
+        FOREIGN KEY (thread_id) REFERENCES threads(id)
+    );
+    CREATE INDEX IF NOT EXISTS idx_user_data_cache_thread
+        ON user_data_cache(thread_id, user_id);
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_user_data_cache_unique
+        ON user_data_cache(thread_id, user_id);
+"""
+# Copies a rowid messages table (with its foreign key and secondary indexes)
+# into the clustered layout. Rows that share a thread and millisecond (the
+# backfill only has second resolution) are spread over consecutive
+# milliseconds in rowid order so their order survives the new key.
+_SQL_REBUILD_MESSAGES = f"""
+    CREATE TABLE messages_clustered {_MESSAGES_TABLE_COLUMNS};
+    INSERT INTO messages_clustered
+        (id, thread_id, role, content, user_id, language, created_at, created_at_ms)
+    SELECT id, thread_id, role, content, user_id, language, created_at,
+        created_at_ms - 1 + row_number() OVER (
+            PARTITION BY thread_id, created_at_ms ORDER BY rowid
+        )
+    FROM messages;
+    DROP TABLE messages;
+    ALTER TABLE messages_clustered RENAME TO messages;
+"""
+_SQL_MESSAGE_TABLE_INFO = "PRAGMA table_info(messages)"
+_SQL_MESSAGE_TABLE_SQL = "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'messages'"
+_SQL_OPTIMIZE = "PRAGMA optimize"
+_SQL_BEGIN = "BEGIN IMMEDIATE"
+_SQL_COMMIT = "COMMIT"
+_SQL_ROLLBACK = "ROLLBACK"
+
+_SQL_ENSURE_THREAD = "INSERT OR IGNORE INTO threads (id) VALUES (?)"
+_SQL_THREAD_EXISTS = "SELECT 1 FROM threads WHERE id = ?"
+_SQL_INSERT_MESSAGE = (
+    "INSERT INTO messages "
+    "(id, thread_id, role, content, user_id, language, created_at_ms) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+# Message IDs are stored as 16-byte UUID blobs and returned as 32-char hex.
+# Rows written before the switch keep their TEXT ID, the 36-char hyphenated
+# str(uuid4()) form, and it is returned unchanged; IDs only ever go out to
+# clients as opaque strings, so nothing here parses or compares either form.
+# ORDER BY names messages.id because a bare "id" there means this alias,
+# which would force a sort instead of following the primary key.
+_MESSAGE_COLUMNS = (
+    "CASE typeof(id) WHEN 'blob' THEN lower(hex(id)) ELSE id END AS id, "
+    "thread_id, role, content, created_at"
+)
+_SQL_THREAD_MESSAGES = (
+    f"SELECT {_MESSAGE_COLUMNS} FROM messages "
+    "WHERE thread_id = ? ORDER BY created_at_ms ASC, messages.id ASC"
+)
+# Whole GET-messages response body built by SQLite's JSON functions: the page
+# of messages, the thread's total and the paging parameters in one statement.
+# json() re-tags the subquery's text as JSON so it nests instead of being
+# quoted as a string.
+_SQL_PAGINATED_THREAD_MESSAGES_JSON = (
+    "SELECT json_object("
+    "'threadId', ?1, "
+    "'messages', json((SELECT json_group_array(json_object("
+    "'id', id, 'thread_id', thread_id, 'role', role, "
+    "'content', content, 'created_at', created_at)) "
+    f"FROM (SELECT {_MESSAGE_COLUMNS} FROM messages "
+    "WHERE thread_id = ?1 ORDER BY created_at_ms ASC, messages.id ASC LIMIT ?2 OFFSET ?3))), "
+    "'total', (SELECT COUNT(*) FROM messages WHERE thread_id = ?1), "
+    "'limit', ?2, "
+    "'offset', ?3)"
+)
+# Newest first so SQLite walks the thread's key range backwards and stops
+# after LIMIT rows; the caller reverses into chronological order
+_SQL_RECENT_THREAD_MESSAGES = (
+    f"SELECT {_MESSAGE_COLUMNS} FROM messages "
+    "WHERE thread_id = ? ORDER BY created_at_ms DESC, messages.id DESC LIMIT ?"
+)
+_SQL_CACHED_USER_DATA = (
+    "SELECT data_json FROM user_data_cache "
+    "WHERE thread_id = ? AND user_id = ? "
+    "ORDER BY created_at DESC LIMIT 1"
+)
+_SQL_SAVE_USER_DATA = (
+    "INSERT OR REPLACE INTO user_data_cache (id, thread_id, user_id, data_json) "
+    "VALUES (?, ?, ?, ?)"
+)
+_SQL_DELETE_OLD_MESSAGES = "DELETE FROM messages WHERE created_at_ms < ?"
+_SQL_DELETE_OLD_CACHE = "DELETE FROM user_data_cache WHERE created_at < datetime('now', ?)"
+
+# (column, definition, backfill) for columns added to messages after its
+# first release; backfill runs right after the ALTER and may be empty
+_MESSAGE_COLUMN_MIGRATIONS = (
+    ("user_id", "user_id TEXT NOT NULL DEFAULT ''", ""),
+    ("language", "language TEXT NOT NULL DEFAULT ''", ""),
+    (
+        "created_at_ms",
+        "created_at_ms INTEGER NOT NULL DEFAULT 0",
+        "UPDATE messages SET created_at_ms = "
+        "CAST(strftime('%s', created_at) AS INTEGER) * 1000",
+    ),
+)
+
+
+def _new_message_ids(count: int) -> list[bytes]:
+    """Return count random version-4 UUIDs as 16-byte blobs.
+
+    All IDs come from a single os.urandom call instead of one per uuid4().
+    """
+    buf = bytearray(os.urandom(16 * count))
+    for i in range(0, 16 * count, 16):
+        buf[i + 6] = (buf[i + 6] & 0x0F) | 0x40  # version 4
+        buf[i + 8] = (buf[i + 8] & 0x3F) | 0x80  # RFC 4122 variant
+    return [bytes(buf[i:i + 16]) for i in range(0, 16 * count, 16)]
+
+
+_last_ms = 0
+
+
+def _now_ms() -> int:
+    """Wall-clock time in epoch milliseconds, the ordering key for messages.
+
+    Strictly increasing within the process, so messages never tie on it and
+    their order does not fall through to the random ID.
+    """
+    global _last_ms
+    now = time.time_ns() // 1_000_000
+    _last_ms = now if now > _last_ms else _last_ms + 1
+    return _last_ms
+
 
 async def get_db() -> aiosqlite.Connection:
     logger.info("Connecting to SQLite database at %s", settings.DATABASE_PATH)
     try:
-        db = await aiosqlite.connect(settings.DATABASE_PATH)
-        db.row_factory = aiosqlite.Row
-        await db.execute("PRAGMA journal_mode=WAL")
-        await db.execute("PRAGMA foreign_keys=ON")
-        await db.execute("PRAGMA busy_timeout=5000")
-        await db.execute("PRAGMA cache_size=-8000")
-        await db.execute("PRAGMA synchronous=NORMAL")
+        # Autocommit: single-statement writes commit on their own without the
+        # driver's hidden BEGIN; multi-statement writes use BEGIN IMMEDIATE
+        db = await aiosqlite.connect(
+            settings.DATABASE_PATH,
+            isolation_level=None,
+            cached_statements=_STATEMENT_CACHE_SIZE,
+        )
+        # Rows stay plain tuples: every query here reads columns by position,
+        # so aiosqlite.Row's per-row wrapper would be pure overhead
+        await db.executescript(_SQL_PRAGMAS)
         return db
     except Exception:
         logger.critical(
@@ -29,188 +220,347 @@ async def get_db() -> aiosqlite.Connection:
         raise
 
 
-async def init_db(db: aiosqlite.Connection) -> None:
-    logger.info("Initializing database schema")
-    await db.executescript("""
-        CREATE TABLE IF NOT EXISTS threads (
-            id TEXT PRIMARY KEY,
-            created_at TEXT NOT NULL DEFAULT (datetime('now'))
-        );
-        CREATE TABLE IF NOT EXISTS messages (
-            id TEXT PRIMARY KEY,
-            thread_id TEXT NOT NULL,
-            role TEXT NOT NULL CHECK (role IN ('user', 'assistant')),
-            content TEXT NOT NULL,
-            user_id TEXT NOT NULL DEFAULT '',
-            language TEXT NOT NULL DEFAULT '',
-            created_at TEXT NOT NULL DEFAULT (datetime('now')),
-            FOREIGN KEY (thread_id) REFERENCES threads(id)
-        );
-        CREATE INDEX IF NOT EXISTS idx_messages_thread_id ON messages(thread_id);
-
-        CREATE TABLE IF NOT EXISTS user_data_cache (
-            id TEXT PRIMARY KEY,
-            thread_id TEXT NOT NULL,
-            user_id TEXT NOT NULL,
-            data_json TEXT NOT NULL,
-            created_at TEXT NOT NULL DEFAULT (datetime('now')),
-            FOREIGN KEY (thread_id) REFERENCES threads(id)
-        );
-        CREATE INDEX IF NOT EXISTS idx_user_data_cache_thread
-            ON user_data_cache(thread_id, user_id);
-        CREATE UNIQUE INDEX IF NOT EXISTS idx_user_data_cache_unique
-            ON user_data_cache(thread_id, user_id);
-    """)
-    # Migration: add columns if they don't exist (safe for existing databases)
-    for col in ("user_id TEXT NOT NULL DEFAULT ''", "language TEXT NOT NULL DEFAULT ''"):
+class ConnectionPool:
+    """Fixed set of long-lived read-only sqlite3 connections.
+
+    Each connection keeps its own page cache and mmap warm across requests.
+    execute_fetchall runs the query on a worker thread (asyncio.to_thread)
+    with whichever connection is idle, skipping aiosqlite's per-connection
+    dispatch, so reads fan out across OS threads. WAL lets them run
+    alongside the writer; writes never go through the pool.
+    """
+
+    def __init__(self, size: int | None = None) -> None:
+        self._size = size if size is not None else settings.DB_READ_POOL_SIZE
+        self._idle: queue.SimpleQueue[sqlite3.Connection] = queue.SimpleQueue()
+        self._connections: list[sqlite3.Connection] = []
+
+    async def open(self) -> None:
+        uri = Path(settings.DATABASE_PATH).resolve().as_uri() + "?mode=ro"
+        for _ in range(self._size):
+            conn = sqlite3.connect(
+                uri,
+                uri=True,
+                check_same_thread=False,
+                cached_statements=_STATEMENT_CACHE_SIZE,
+            )
+            conn.executescript(_SQL_PRAGMAS)
+            self._connections.append(conn)
+            self._idle.put(conn)
+        logger.info("Opened read-only connection pool (size=%d)", self._size)
+
+    async def execute_fetchall(self, sql: str, parameters: tuple = ()) -> list[tuple]:
+        """Run a read query on an idle pooled connection and return all rows."""
+        return await asyncio.to_thread(self._fetchall, sql, parameters)
+
+    def _fetchall(self, sql: str, parameters: tuple) -> list[tuple]:
+        conn = self._idle.get()
         try:
-            await db.execute(f"ALTER TABLE messages ADD COLUMN {col}")
-        except sqlite3.OperationalError:
-            pass  # Column already exists
-    await db.commit()
-    logger.info("Database schema initialized")
+            return conn.execute(sql, parameters).fetchall()
+        finally:
+            self._idle.put(conn)
 
+    async def close(self) -> None:
+        for conn in self._connections:
+            conn.close()
+        self._connections.clear()
 
-async def ensure_thread(db: aiosqlite.Connection, thread_id: str) -> None:
-    """Ensure a thread row exists in the database (auto-create if missing)."""
-    try:
-        await db.execute(
-            "INSERT OR IGNORE INTO threads (id) VALUES (?)", (thread_id,)
-        )
-        await db.commit()
-    except Exception:
-        logger.error("Failed to ensure thread %s", thread_id, exc_info=True)
-        raise
+
+async def init_db(db: aiosqlite.Connection) -> None:
+    logger.info("Initializing database schema")
+    # Migration: add columns missing from databases created before they
+    # existed. A fresh database has no messages columns yet and gets them
+    # all from CREATE TABLE.
+    columns = {row[1] for row in await db.execute_fetchall(_SQL_MESSAGE_TABLE_INFO)}
+    script = [_SQL_BEGIN + ";", _SQL_SCHEMA]
+    if columns:
+        for name, ddl, backfill in _MESSAGE_COLUMN_MIGRATIONS:
+            if name not in columns:
+                logger.info("Adding messages.%s column", name)
+                script.append(f"ALTER TABLE messages ADD COLUMN {ddl};")
+                if backfill:
+                    script.append(backfill + ";")
+        table_sql = (await db.execute_fetchall(_SQL_MESSAGE_TABLE_SQL))[0][0]
+        if "WITHOUT ROWID" not in table_sql:
+            logger.info("Rebuilding messages table clustered by thread")
+            script.append(_SQL_REBUILD_MESSAGES)
+    script.append(_SQL_COMMIT + ";")
+    # Schema and migrations go through one executescript call and commit once
+    await db.executescript("\n".join(script))
+    logger.info("Database schema initialized")
 
 
 async def thread_exists(db: aiosqlite.Connection, thread_id: str) -> bool:
     try:
-        cursor = await db.execute(
-            "SELECT 1 FROM threads WHERE id = ?", (thread_id,)
-        )
-        row = await cursor.fetchone()
-        return row is not None
+        rows = await db.execute_fetchall(_SQL_THREAD_EXISTS, (thread_id,))
+        return bool(rows)
     except Exception:
         logger.error("Failed to check thread existence for %s", thread_id, exc_info=True)
         raise
 
 
-async def add_message(
-    db: aiosqlite.Connection,
-    thread_id: str,
-    role: str,
-    content: str,
-    user_id: str = "",
-    language: str = "",
-) -> str:
-    message_id = str(uuid.uuid4())
-    try:
-        await db.execute(
-            "INSERT INTO messages (id, thread_id, role, content, user_id, language) "
-            "VALUES (?, ?, ?, ?, ?, ?)",
-            (message_id, thread_id, role, content, user_id, language),
+def _thread_ids(rows: list[tuple]) -> list[tuple[str]]:
+    """Distinct thread IDs of message rows, as parameters for _SQL_ENSURE_THREAD."""
+    return [(thread_id,) for thread_id in {row[1] for row in rows}]
+
+
+class MessageWriter:
+    """Group-commits messages written by concurrent requests.
+
+    Runs on its own thread with a plain sqlite3 connection in autocommit
+    mode. add() queues a row and awaits a future; the thread takes
+    everything queued since its last commit and inserts it in one
+    BEGIN IMMEDIATE/executemany/COMMIT, so N concurrent writers cost one
+    fsync and no per-call executor hop. add_many() queues several rows as
+    one item, so they always land in the same transaction.
+    """
+
+    def __init__(self, path: str | None = None, max_batch: int = _WRITE_BATCH_MAX) -> None:
+        self._path = path if path is not None else settings.DATABASE_PATH
+        self._max_batch = max_batch
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._conn: sqlite3.Connection | None = None
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._conn = sqlite3.connect(
+            self._path,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=_STATEMENT_CACHE_SIZE,
         )
-        await db.commit()
-    except Exception:
-        logger.error(
-            "Failed to add %s message to thread %s", role, thread_id, exc_info=True,
+        self._conn.executescript(_SQL_PRAGMAS)
+        self._thread = threading.Thread(
+            target=self._run, name="message-writer", daemon=True,
         )
-        raise
-    logger.debug("Added %s message %s to thread %s", role, message_id, thread_id)
-    return message_id
+        self._thread.start()
+
+    async def close(self) -> None:
+        """Flush queued messages, then stop the writer thread."""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        await asyncio.to_thread(self._thread.join)
+        self._conn.close()
+        self._thread = None
+        self._conn = None
+
+    async def add(
+        self,
+        thread_id: str,
+        role: str,
+        content: str,
+        user_id: str = "",
+        language: str = "",
+    ) -> str:
+        try:
+            (message_id,) = await self._submit(
+                [(thread_id, role, content, user_id, language, _now_ms())]
+            )
+        except Exception:
+            logger.error(
+                "Failed to add %s message to thread %s", role, thread_id, exc_info=True,
+            )
+            raise
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Added %s message %s to thread %s", role, message_id, thread_id)
+        return message_id
+
+    async def add_many(
+        self,
+        thread_id: str,
+        messages: list[tuple[str, str]],
+        user_id: str = "",
+        language: str = "",
+    ) -> list[str]:
+        """Insert several (role, content) messages in one transaction.
+
+        Returns the new message IDs in input order.
+        """
+        if not messages:
+            return []
+        try:
+            message_ids = await self._submit([
+                (thread_id, role, content, user_id, language, _now_ms())
+                for role, content in messages
+            ])
+        except Exception:
+            logger.error(
+                "Failed to add %d messages to thread %s", len(messages), thread_id, exc_info=True,
+            )
+            raise
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Added %d messages to thread %s", len(message_ids), thread_id)
+        return message_ids
+
+    async def _submit(self, rows: list[tuple]) -> list[str]:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        # The writer thread assigns the IDs and resolves the future with them
+        self._queue.put((rows, future, loop))
+        return await future
+
+    def _run(self) -> None:
+        get = self._queue.get
+        get_nowait = self._queue.get_nowait
+        while True:
+            item = get()
+            if item is None:
+                return
+            batch = [item]
+            stopping = False
+            while len(batch) < self._max_batch:
+                try:
+                    item = get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._write(batch)
+            if stopping:
+                return
+
+    def _write(
+        self, batch: list[tuple[list[tuple], asyncio.Future, asyncio.AbstractEventLoop]]
+    ) -> None:
+        message_ids = iter(_new_message_ids(sum(len(fields) for fields, _, _ in batch)))
+        item_rows = [
+            [(next(message_ids), *row_fields) for row_fields in fields]
+            for fields, _, _ in batch
+        ]
+        rows = [row for item in item_rows for row in item]
+        try:
+            self._insert(rows)
+        except sqlite3.IntegrityError:
+            # Retry item by item so one bad item does not fail its neighbours
+            for item, (_, future, loop) in zip(item_rows, batch, strict=True):
+                try:
+                    self._insert(item)
+                except Exception as e:
+                    loop.call_soon_threadsafe(_resolve, future, None, e)
+                else:
+                    loop.call_soon_threadsafe(
+                        _resolve, future, [row[0].hex() for row in item], None,
+                    )
+            return
+        except Exception as e:
+            logger.error("Failed to commit batch of %d messages", len(rows), exc_info=True)
+            for _, future, loop in batch:
+                loop.call_soon_threadsafe(_resolve, future, None, e)
+            return
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Committed batch of %d messages", len(rows))
+        for item, (_, future, loop) in zip(item_rows, batch, strict=True):
+            loop.call_soon_threadsafe(_resolve, future, [row[0].hex() for row in item], None)
+
+    def _insert(self, rows: list[tuple]) -> None:
+        """Insert rows and their threads in one transaction, retrying if the database is busy."""
+        conn = self._conn
+        for attempt in range(_BUSY_RETRIES + 1):
+            try:
+                conn.execute(_SQL_BEGIN)
+                conn.executemany(_SQL_ENSURE_THREAD, _thread_ids(rows))
+                conn.executemany(_SQL_INSERT_MESSAGE, rows)
+                conn.execute(_SQL_COMMIT)
+                return
+            except Exception as e:
+                if conn.in_transaction:
+                    conn.execute(_SQL_ROLLBACK)
+                busy = isinstance(e, sqlite3.OperationalError) and "locked" in str(e)
+                if not busy or attempt == _BUSY_RETRIES:
+                    raise
+                logger.warning(
+                    "Database busy inserting %d messages, retrying (attempt %d)",
+                    len(rows), attempt + 1,
+                )
+                time.sleep(0.05 * (attempt + 1))
+
+
+def _resolve(
+    future: asyncio.Future, result: list[str] | None, error: BaseException | None
+) -> None:
+    # Runs on the event loop; the awaiting request may have been cancelled
+    if future.cancelled():
+        return
+    if error is None:
+        future.set_result(result)
+    else:
+        future.set_exception(error)
+
+
+def _rows_to_messages(rows: list) -> list[dict]:
+    # Unpacking each tuple in the loop target is cheaper than five row[i]
+    # lookups
+    return [
+        {
+            "id": message_id,
+            "thread_id": thread_id,
+            "role": role,
+            "content": content,
+            "created_at": created_at,
+        }
+        for message_id, thread_id, role, content, created_at in rows
+    ]
 
 
 async def get_thread_messages(
     db: aiosqlite.Connection, thread_id: str
 ) -> list[dict]:
+    # A thread's full history is unbounded, so rows are converted one
+    # fetchmany batch at a time instead of holding every raw row alongside
+    # its dict. aiosqlite's own async iteration fetches a single row per
+    # thread hop, hence the explicit batch size.
+    messages: list[dict] = []
     try:
-        cursor = await db.execute(
-            "SELECT id, thread_id, role, content, created_at FROM messages "
-            "WHERE thread_id = ? ORDER BY created_at ASC, rowid ASC",
-            (thread_id,),
-        )
-        rows = await cursor.fetchall()
+        async with db.execute(_SQL_THREAD_MESSAGES, (thread_id,)) as cursor:
+            while rows := await cursor.fetchmany(_FETCH_BATCH_SIZE):
+                messages.extend(_rows_to_messages(rows))
     except Exception:
         logger.error("Failed to fetch messages for thread %s", thread_id, exc_info=True)
         raise
-    return [
-        {
-            "id": row[0],
-            "thread_id": row[1],
-            "role": row[2],
-            "content": row[3],
-            "created_at": row[4],
-        }
-        for row in rows
-    ]
+    return messages
 
 
-async def get_paginated_thread_messages(
-    db: aiosqlite.Connection, thread_id: str, limit: int, offset: int
-) -> tuple[list[dict], int]:
-    """Fetch messages for a thread with SQL-level pagination. Returns (messages, total)."""
-    logger.debug("Fetching messages for thread %s (limit=%d, offset=%d)", thread_id, limit, offset)
-    try:
-        count_cursor = await db.execute(
-            "SELECT COUNT(*) FROM messages WHERE thread_id = ?",
-            (thread_id,),
-        )
-        total = (await count_cursor.fetchone())[0]
+async def get_paginated_thread_messages_json(
+    db: aiosqlite.Connection | ConnectionPool, thread_id: str, limit: int, offset: int
+) -> str:
+    """Fetch a page of a thread's messages as the API response body, in JSON text.
 
-        cursor = await db.execute(
-            "SELECT id, thread_id, role, content, created_at FROM messages "
-            "WHERE thread_id = ? ORDER BY created_at ASC, rowid ASC "
-            "LIMIT ? OFFSET ?",
-            (thread_id, limit, offset),
+    The body is {"threadId", "messages", "total", "limit", "offset"}, built
+    inside SQLite so no per-row Python objects or JSON encoding are needed.
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Fetching messages JSON for thread %s (limit=%d, offset=%d)", thread_id, limit, offset,
+        )
+    try:
+        rows = await db.execute_fetchall(
+            _SQL_PAGINATED_THREAD_MESSAGES_JSON, (thread_id, limit, offset),
         )
-        rows = await cursor.fetchall()
     except Exception:
         logger.error(
             "Failed to fetch paginated messages for thread %s", thread_id, exc_info=True,
         )
         raise
-    messages = [
-        {
-            "id": row[0],
-            "thread_id": row[1],
-            "role": row[2],
-            "content": row[3],
-            "created_at": row[4],
-        }
-        for row in rows
-    ]
-    return messages, total
+    return rows[0][0]
 
 
 async def get_recent_thread_messages(
-    db: aiosqlite.Connection, thread_id: str, limit: int
+    db: aiosqlite.Connection | ConnectionPool, thread_id: str, limit: int
 ) -> list[dict]:
     """Fetch only the most recent `limit` messages for a thread, ordered chronologically."""
-    logger.debug("Fetching last %d messages for thread %s", limit, thread_id)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Fetching last %d messages for thread %s", limit, thread_id)
     try:
-        cursor = await db.execute(
-            "SELECT id, thread_id, role, content, created_at FROM "
-            "(SELECT id, thread_id, role, content, created_at, rowid FROM messages "
-            "WHERE thread_id = ? ORDER BY created_at DESC, rowid DESC LIMIT ?) "
-            "ORDER BY created_at ASC, rowid ASC",
-            (thread_id, limit),
-        )
-        rows = await cursor.fetchall()
+        rows = await db.execute_fetchall(_SQL_RECENT_THREAD_MESSAGES, (thread_id, limit))
     except Exception:
         logger.error(
             "Failed to fetch recent messages for thread %s", thread_id, exc_info=True,
         )
         raise
-    return [
-        {
-            "id": row[0],
-            "thread_id": row[1],
-            "role": row[2],
-            "content": row[3],
-            "created_at": row[4],
-        }
-        for row in rows
-    ]
+    return _rows_to_messages(rows[::-1])
 
 
 # ---------------------------------------------------------------------------
@@ -221,13 +571,8 @@ async def get_cached_user_data(
 ) -> dict | None:
     """Return cached user data for this thread+user, or None if not cached."""
     try:
-        cursor = await db.execute(
-            "SELECT data_json FROM user_data_cache "
-            "WHERE thread_id = ? AND user_id = ? "
-            "ORDER BY created_at DESC LIMIT 1",
-            (thread_id, user_id),
-        )
-        row = await cursor.fetchone()
+        rows = await db.execute_fetchall(_SQL_CACHED_USER_DATA, (thread_id, user_id))
+        row = rows[0] if rows else None
     except Exception:
         logger.error(
             "Failed to fetch cached user data for thread %s, user %s",
@@ -237,8 +582,8 @@ async def get_cached_user_data(
     if row is None:
         return None
     try:
-        return json.loads(row[0])
-    except (json.JSONDecodeError, TypeError):
+        return orjson.loads(row[0])
+    except (orjson.JSONDecodeError, TypeError):
         logger.error("Corrupt cached user data for thread %s, user %s", thread_id, user_id)
         return None
 
@@ -247,15 +592,17 @@ async def save_user_data(
     db: aiosqlite.Connection, thread_id: str, user_id: str, data: dict
 ) -> str:
     """Save fetched user data to cache. Returns the cache entry ID."""
-    cache_id = str(uuid.uuid4())
-    data_json = json.dumps(data, ensure_ascii=False, default=str)
+    cache_id = uuid.uuid4().hex
+    # orjson walks the nested aggregate in C and, like ensure_ascii=False,
+    # writes non-ASCII text unescaped
+    data_json = orjson.dumps(
+        data, default=str, option=orjson.OPT_NON_STR_KEYS
+    ).decode()
     try:
         await db.execute(
-            "INSERT OR REPLACE INTO user_data_cache (id, thread_id, user_id, data_json) "
-            "VALUES (?, ?, ?, ?)",
+            _SQL_SAVE_USER_DATA,
             (cache_id, thread_id, user_id, data_json),
         )
-        await db.commit()
     except Exception:
         logger.error(
             "Failed to save user data cache for thread %s, user %s",
@@ -266,6 +613,11 @@ async def save_user_data(
     return cache_id
 
 
+async def optimize_db(db: aiosqlite.Connection) -> None:
+    """Let SQLite refresh query-planner statistics where they have gone stale."""
+    await db.execute(_SQL_OPTIMIZE)
+
+
 # ---------------------------------------------------------------------------
 # Retention cleanup
 # ---------------------------------------------------------------------------
@@ -281,15 +633,17 @@ async def cleanup_old_data(
     message_days = message_days if message_days is not None else settings.MESSAGE_RETENTION_DAYS
     cache_days = cache_days if cache_days is not None else settings.CACHE_RETENTION_DAYS
 
+    # Each DELETE commits on its own: the two need not be atomic, and an
+    # explicit transaction on the shared connection could interleave with
+    # save_user_data's writes
     msg_result = await db.execute(
-        "DELETE FROM messages WHERE created_at < datetime('now', ?)",
-        (f"-{message_days} days",),
+        _SQL_DELETE_OLD_MESSAGES,
+        (_now_ms() - message_days * 86_400_000,),
     )
     cache_result = await db.execute(
-        "DELETE FROM user_data_cache WHERE created_at < datetime('now', ?)",
+        _SQL_DELETE_OLD_CACHE,
         (f"-{cache_days} days",),
     )
-    await db.commit()
 
     msgs_deleted = msg_result.rowcount
     cache_deleted = cache_result.rowcount
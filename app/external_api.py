@@ -5,11 +5,20 @@ This is a faithful async port of the proven working user_service.py,
 using httpx.AsyncClient instead of synchronous requests.
 """
 
+import asyncio
+import functools
 import logging
-from datetime import datetime, timedelta
+import random
+import re
+import time
+import weakref
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import Any
 from urllib.parse import urlparse
 
+import ciso8601
 import httpx
+import orjson
 
 from app.config import settings
 
@@ -18,30 +27,325 @@ logger = logging.getLogger(__name__)
 _parsed = urlparse(settings.BACKEND_API_URL)
 _BASE_ORIGIN = f"{_parsed.scheme}://{_parsed.netloc}"
 
+# Endpoint URLs, fixed for the process like the settings they derive from
+_BASE_URL = settings.BACKEND_API_URL.rstrip("/")
+_URL_SCHEMES_BY_LABOR = f"{_BASE_URL}/schemes/get_schemes_by_labor"
+_URL_RENEWAL_DATE = f"{_BASE_URL}/user/get-renewal-date"
+_URL_REG_DETAILS = f"{_BASE_URL}/user/get-user-registration-details"
+_URL_LABOUR_STATUS = f"{_BASE_URL}/public/labour/status"
+_URL_SCHEME_STATUS = f"{_BASE_URL}/public/schemes/status"
+_URL_REJECTION_REASON = f"{_BASE_URL}/public/schemes/rejection-reason"
+_URL_REG_REJECTION = f"{_BASE_URL}/public/v2/registration-renewal/rejection-reason"
+
+# Upper bound on backend requests in flight across the whole process; it
+# is halved on every 429 and creeps back up one slot per other response
+_MAX_OUTBOUND_REQUESTS = 100
+
+# Transient failures (rate limiting, an overloaded gateway, timeouts) are
+# retried up to EXTERNAL_API_RETRIES times, sleeping a random fraction of
+# an exponentially growing delay between attempts
+_RETRY_STATUS_CODES = frozenset({429, 503, 504})
+_RETRY_BACKOFF_BASE = 0.2
+_RETRY_BACKOFF_CAP = 2.0
+
+# After this many consecutive failed requests (each counted once, after its
+# retries) a backend host is treated as down and calls to it fail fast for
+# the cooldown instead of each user waiting out their own timeouts
+_BREAKER_THRESHOLD = 5
+_BREAKER_COOLDOWN = 30.0
+
+# Per-phase budgets for the top-level user calls and the public status
+# lookups. The pool wait gets its own, longer limit so a saturated fan-out
+# fails as httpx.PoolTimeout instead of eating into the read budget.
+_TOP_TIMEOUT = httpx.Timeout(10.0, connect=3.0, pool=15.0)
+_SUB_TIMEOUT = httpx.Timeout(5.0, connect=2.0, pool=15.0)
+
+# Registration validity windows, measured from the validity end date: a
+# year of buffer, then 90 days of waiting before re-registration. Indexed
+# by how many of the thresholds (end, buffer end, waiting end) have passed;
+# entries are (status, is_active, is_buffer).
+_ONE_YEAR = timedelta(days=365)
+_WAITING_PERIOD_END = timedelta(days=365 + 90)
+_VALIDITY_STATES = (
+    ("Active", True, False),
+    ("Active (Buffer Period)", False, True),
+    ("Inactive (Waiting Period)", False, False),
+    ("Expired (Re-registration Required)", False, False),
+)
+
+# Scheme-history keywords the eligibility rules look for, matched
+# case-insensitively in place so no folded copy of each string is built
+_APPROVED_RE = re.compile("approved", re.IGNORECASE)
+_ELIGIBILITY_KEYWORD_RE = re.compile("pension|disability", re.IGNORECASE)
+
+# Bodies are encoded with orjson and sent as content=, so requests without
+# the full browser header set still need the content type. Kept as
+# httpx.Headers so httpx copies the already-encoded list per request
+# instead of re-normalizing a dict.
+_JSON_HEADERS = httpx.Headers({"Content-Type": "application/json"})
+
+# Successful responses of the idempotent status and rejection-reason
+# endpoints, keyed by request, so a dashboard reload within the TTL skips
+# the network. Oldest entry is evicted once the cap is reached.
+_RESPONSE_CACHE_TTL = 60.0
+_RESPONSE_CACHE_MAX = 1024
+_response_cache: dict[tuple, tuple[float, Any]] = {}
+
+
+class _AdmissionController:
+    """Admits outbound requests while fewer than ``limit`` are in flight.
+
+    A counter guarded by an asyncio.Condition rather than a Semaphore, so
+    the limit can be lowered or raised while requests are waiting.
+    """
 
-def _build_headers(auth_token: str) -> dict[str, str]:
-    return {
-        "Accept": "application/json, text/plain, */*",
-        "Authorization": f"Bearer {auth_token}",
-        "Content-Type": "application/json",
-        "Origin": _BASE_ORIGIN,
-        "Referer": f"{_BASE_ORIGIN}/u/home",
-        "User-Agent": (
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/143.0.0.0 Safari/537.36"
+    def __init__(self, max_limit: int) -> None:
+        self.max_limit = max_limit
+        self.limit = max_limit
+        self.active = 0
+        self._cond = asyncio.Condition()
+
+    async def __aenter__(self) -> "_AdmissionController":
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.active < self.limit)
+            self.active += 1
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        async with self._cond:
+            self.active -= 1
+            free = self.limit - self.active
+            if free > 0:
+                self._cond.notify(free)
+
+    def record(self, status_code: int) -> None:
+        """Adjust the limit after a response: halve on 429, else grow by one."""
+        if status_code == 429:
+            self.limit = max(1, self.limit // 2)
+            logger.warning("Backend rate limited, outbound limit now %d", self.limit)
+        elif self.limit < self.max_limit:
+            self.limit += 1
+
+
+class _LoopState:
+    """The module's event-loop-bound objects, one set per running loop.
+
+    Pooled connections, the admission condition and in-flight tasks all
+    belong to the loop that created them and must not be used from another
+    one (a second loop in tests, or after a reload).
+    """
+
+    def __init__(self) -> None:
+        # Pooled client handed out by get_shared_client
+        self.client: httpx.AsyncClient | None = None
+        self.admission = _AdmissionController(_MAX_OUTBOUND_REQUESTS)
+        # Requests currently on the wire, keyed like the response cache.
+        # Concurrent callers for the same request await the task the first
+        # caller started instead of issuing their own (single-flight).
+        self.inflight: dict[tuple, asyncio.Task] = {}
+
+
+_loop_states: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _loop_state() -> _LoopState:
+    """Return the running loop's state, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    state = _loop_states.get(loop)
+    if state is None:
+        state = _loop_states[loop] = _LoopState()
+    return state
+
+
+class _BackendUnavailableError(Exception):
+    """Raised instead of calling the backend while the circuit breaker is open."""
+
+
+class _CircuitBreaker:
+    """Fails calls to one host fast for ``cooldown`` seconds after
+    ``threshold`` consecutive failures.
+
+    Once the cooldown has passed calls go through again; the next failure
+    re-opens the breaker and the next success closes it.
+    """
+
+    def __init__(self, host: str, threshold: int, cooldown: float) -> None:
+        self.host = host
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.open_until = 0.0
+
+    def check(self) -> None:
+        if time.monotonic() < self.open_until:
+            raise _BackendUnavailableError(
+                f"Backend {self.host} unavailable, request skipped"
+            )
+
+    def record_success(self) -> None:
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.failures >= self.threshold:
+            now = time.monotonic()
+            if now >= self.open_until:
+                logger.warning(
+                    "Backend %s failed %d times in a row, pausing calls for %.0fs",
+                    self.host, self.failures, self.cooldown,
+                )
+            self.open_until = now + self.cooldown
+
+
+# Not loop-bound, so shared by every loop in the process
+_breakers: dict[str, _CircuitBreaker] = {}
+
+
+def _breaker_for(url: str) -> _CircuitBreaker:
+    """Return the circuit breaker of ``url``'s host, creating it on first use."""
+    host = urlparse(url).netloc
+    breaker = _breakers.get(host)
+    if breaker is None:
+        breaker = _breakers[host] = _CircuitBreaker(
+            host, _BREAKER_THRESHOLD, _BREAKER_COOLDOWN
+        )
+    return breaker
+
+
+async def _send(
+    client: httpx.AsyncClient,
+    url: str,
+    *,
+    headers: httpx.Headers | None = None,
+    content: bytes | None = None,
+    timeout: httpx.Timeout,
+) -> httpx.Response:
+    """POST ``content`` to ``url`` (GET it when None) under admission control.
+
+    Timeouts, connection failures and 429/503/504 responses are retried
+    with jittered exponential backoff; the last response is returned
+    whatever its status. Pool timeouts are not retried since they mean
+    this process, not the backend, is saturated.
+    """
+    admission = _loop_state().admission
+    breaker = _breaker_for(url)
+    retries = settings.EXTERNAL_API_RETRIES
+    attempt = 0
+    while True:
+        breaker.check()
+        try:
+            async with admission:
+                if content is None:
+                    resp = await client.get(url, headers=headers, timeout=timeout)
+                else:
+                    resp = await client.post(
+                        url, headers=headers, content=content, timeout=timeout
+                    )
+                admission.record(resp.status_code)
+        except httpx.PoolTimeout:
+            raise
+        except (httpx.TimeoutException, httpx.ConnectError) as e:
+            if attempt == retries:
+                breaker.record_failure()
+                raise
+            logger.debug("Retrying %s after %s", url, type(e).__name__)
+        else:
+            if resp.status_code not in _RETRY_STATUS_CODES or attempt == retries:
+                # The breaker sees the request's final outcome only
+                if resp.status_code >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                return resp
+            logger.debug("Retrying %s after HTTP %s", url, resp.status_code)
+        await asyncio.sleep(
+            random.uniform(0, min(_RETRY_BACKOFF_CAP, _RETRY_BACKOFF_BASE * 2 ** attempt))
+        )
+        attempt += 1
+
+
+def _parse_iso(value: str) -> datetime:
+    """Parse an ISO-8601 timestamp from the backend, "Z" suffix included."""
+    return ciso8601.parse_datetime(value)
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_ymd(value: str) -> datetime:
+    """Parse a "%Y-%m-%d" date exactly as strptime does, memoized by raw string.
+
+    Zero-padded dates, the form the backend sends, go through the C
+    fromisoformat parser; anything else (e.g. unpadded months) is left to
+    strptime, which compiles its format on every call.
+    """
+    if len(value) == 10 and value[4] == value[7] == "-" and value.isascii():
+        return datetime.fromisoformat(value)
+    return datetime.strptime(value, "%Y-%m-%d")
+
+
+def build_client() -> httpx.AsyncClient:
+    """Build the client fetch_user_data expects.
+
+    Every call goes to the same origin, so one pooled HTTP/2 connection is
+    kept alive and multiplexed across the concurrent per-scheme requests
+    instead of paying a TCP+TLS handshake per call. The backend's
+    certificate chain is not verifiable, hence verify=False.
+    """
+    return httpx.AsyncClient(
+        http2=True,
+        verify=False,
+        limits=httpx.Limits(
+            max_connections=1000,
+            max_keepalive_connections=100,
+            keepalive_expiry=30,
         ),
-    }
+        timeout=_TOP_TIMEOUT,
+    )
+
+
+# Everything but the Authorization header is fixed for the process
+_STATIC_HEADERS = {
+    "Accept": "application/json, text/plain, */*",
+    "Content-Type": "application/json",
+    "Origin": _BASE_ORIGIN,
+    "Referer": f"{_BASE_ORIGIN}/u/home",
+    "User-Agent": (
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/143.0.0.0 Safari/537.36"
+    ),
+}
+
+
+def get_shared_client() -> httpx.AsyncClient:
+    """Return the running loop's pooled client, building it on first use."""
+    state = _loop_state()
+    if state.client is None or state.client.is_closed:
+        state.client = build_client()
+    return state.client
+
+
+@functools.lru_cache(maxsize=1024)
+def _build_headers(auth_token: str) -> httpx.Headers:
+    """Headers for the user's calls, normalized once per auth token.
+
+    Cached because a user's token is reused across their requests. The
+    result is shared, so callers must not mutate it.
+    """
+    return httpx.Headers({**_STATIC_HEADERS, "Authorization": f"Bearer {auth_token}"})
 
 
 async def fetch_user_data(
-    client: httpx.AsyncClient, user_id: str, auth_token: str
+    client: httpx.AsyncClient | None, user_id: str, auth_token: str
 ) -> dict:
     """
     Fetches user data from multiple endpoints and aggregates them.
     Direct async port of the proven working user_service.py.
+
+    ``client`` should come from build_client() so the fan-out shares one
+    keep-alive HTTP/2 connection; None uses get_shared_client().
     """
-    base_url = settings.BACKEND_API_URL.rstrip("/")
+    if client is None:
+        client = get_shared_client()
     headers = _build_headers(auth_token)
 
     aggregated_data = {
@@ -52,164 +356,183 @@ async def fetch_user_data(
         "fetch_status": "partial",
     }
 
-    print(f"\n[EXT-API] Starting user data aggregation for user_id={user_id}")
-    print(f"[EXT-API] Base API URL: {base_url}")
+    logger.debug(
+        "Starting user data aggregation for user_id=%s (base URL %s)", user_id, _BASE_URL
+    )
 
-    # ------------------------------------------------------------------
-    # 1. Get Schemes by Labour (Enhanced Processing)
-    # ------------------------------------------------------------------
+    # The three top-level calls are independent, so they run concurrently.
+    # Registration only needs the schemes result for eligibility and awaits
+    # the schemes task itself; results are merged in the original order.
+    # EXTERNAL_API_TIMEOUT caps the whole aggregation: sections still
+    # running at the deadline are cancelled and reported as timed out.
+    timed_out = False
     try:
-        url = f"{base_url}/schemes/get_schemes_by_labor"
+        async with asyncio.timeout(settings.EXTERNAL_API_TIMEOUT):
+            async with asyncio.TaskGroup() as tg:
+                schemes = tg.create_task(_fetch_schemes(client, headers, user_id))
+                renewal = tg.create_task(_fetch_renewal_date(client, headers, user_id))
+                registration = tg.create_task(
+                    _fetch_registration_details(client, headers, user_id, schemes)
+                )
+    except TimeoutError:
+        timed_out = True
+        logger.warning(
+            "User data aggregation for user %s exceeded %.1fs",
+            user_id, settings.EXTERNAL_API_TIMEOUT,
+        )
+
+    # The fetch only counts as completed when every section produced its
+    # data: one that errored, was cancelled or returned nothing makes it
+    # partial, whether or not the deadline fired
+    complete = True
+    for section, task in (
+        ("schemes", schemes),
+        ("renewal_date", renewal),
+        ("registration_details", registration),
+    ):
+        if task.cancelled():
+            aggregated_data[f"{section}_error"] = "Timed out" if timed_out else "Cancelled"
+            complete = False
+            continue
+        section_result = task.result()
+        aggregated_data.update(section_result)
+        if section not in section_result or f"{section}_error" in section_result:
+            complete = False
+
+    aggregated_data["fetch_status"] = "completed" if complete else "partial"
+    logger.debug("Data aggregation completed for user %s", user_id)
+
+    return aggregated_data
+
+
+async def _fetch_schemes(
+    client: httpx.AsyncClient, headers: httpx.Headers, user_id: str
+) -> dict:
+    """Get Schemes by Labour (Enhanced Processing)."""
+    result: dict = {}
+    try:
+        url = _URL_SCHEMES_BY_LABOR
         payload = {
             "board_id": 1,
             "labour_user_id": int(user_id) if user_id.isdigit() else user_id,
         }
 
-        print(f"[EXT-API] SCHEMES API CALL: {url}")
-        resp = await client.post(url, headers=headers, json=payload, timeout=10)
-        print(f"[EXT-API] Schemes HTTP Status: {resp.status_code}")
+        logger.debug("Schemes API call: %s", url)
+        resp = await _send(
+            client, url, headers=headers, content=orjson.dumps(payload), timeout=_TOP_TIMEOUT
+        )
+        logger.debug("Schemes HTTP status: %s (%s)", resp.status_code, resp.http_version)
 
         if resp.status_code == 200:
-            raw_data = resp.json()
+            raw_data = orjson.loads(resp.content)
             schemes_list = raw_data.get("data", []) if isinstance(raw_data, dict) else []
 
             if not schemes_list:
-                print("[EXT-API] No schemes found in response.")
-                aggregated_data["schemes"] = "No schemes applied."
+                logger.debug("No schemes found in response")
+                result["schemes"] = "No schemes applied."
             else:
-                print(f"[EXT-API] Raw schemes count: {len(schemes_list)}. Processing...")
+                logger.debug("Raw schemes count: %d", len(schemes_list))
 
                 # Step 1: Deduplication by scheme_id (keeping latest applied_date)
+                # scheme_id -> (applied date, scheme). Dates are only needed
+                # to break ties, so they stay None until the first collision
+                # for a scheme_id and are kept in the entry after that
                 unique_schemes: dict = {}
                 for scheme in schemes_list:
                     s_id = scheme.get("scheme_id")
-                    app_date_str = scheme.get("applied_date")
                     if not s_id:
                         continue
 
-                    current_dt = datetime.min
-                    if app_date_str:
-                        try:
-                            curr_str = app_date_str.replace("Z", "+00:00")
-                            current_dt = datetime.fromisoformat(curr_str)
-                        except Exception as e:
-                            print(f"[EXT-API] Date parse error for scheme {s_id}: {e}")
-
-                    if s_id not in unique_schemes:
-                        unique_schemes[s_id] = {"data": scheme, "date": current_dt}
-                    elif current_dt > unique_schemes[s_id]["date"]:
-                        unique_schemes[s_id] = {"data": scheme, "date": current_dt}
-
-                processed_list = [v["data"] for v in unique_schemes.values()]
-                print(f"[EXT-API] Unique schemes count: {len(processed_list)}")
-
-                # Step 2 & 3: Fetch Status and Rejection Reasons
-                final_schemes_info = []
-                for scheme in processed_list:
-                    scheme_id = scheme.get("scheme_id")
-                    app_code = scheme.get("scheme_application_code")
-                    scheme_name = scheme.get("scheme_name", "Unknown Scheme")
-
-                    print(f"[EXT-API] Fetching status for: {scheme_name} ({app_code})...")
-
-                    status_url = f"{base_url}/public/schemes/status"
-                    status_payload = {
-                        "schemeId": scheme_id,
-                        "schemeApplicationCode": app_code,
-                        "mobileNumber": "",
-                    }
-
-                    try:
-                        status_resp = await client.post(
-                            status_url, json=status_payload, timeout=5
-                        )
-                        status_data_full = status_resp.json()
-                        status_success = status_data_full.get("success", False)
-                        status_items = status_data_full.get("data", [])
-
-                        scheme_status_text = "Status check failed"
-                        reasons_list = []
-
-                        if status_success and status_items:
-                            item = status_items[0]
-                            application_status = item.get("application_status")
-                            full_status_desc = item.get("status")
-                            avail_id = item.get("id")
-
-                            scheme_status_text = (
-                                f"Application Status: {application_status}. "
-                                f"({full_status_desc})"
-                            )
+                    stored = unique_schemes.get(s_id)
+                    if stored is None:
+                        unique_schemes[s_id] = (None, scheme)
+                        continue
 
-                            if application_status == "Rejected" and avail_id:
-                                print(f"[EXT-API] Scheme Rejected. Fetching reason for ID {avail_id}...")
-                                reason_url = (
-                                    f"{base_url}/public/schemes/rejection-reason"
-                                    f"?availId={avail_id}&reasonType=FINAL"
-                                )
-                                try:
-                                    r_resp = await client.get(reason_url, timeout=5)
-                                    r_data = r_resp.json()
-                                    if r_data.get("success"):
-                                        for r in r_data.get("data", []):
-                                            if r.get("rejection_reason"):
-                                                reasons_list.append(r["rejection_reason"])
-                                except Exception as re:
-                                    print(f"[EXT-API] Error fetching rejection reason: {re}")
-
-                        info_block = {
-                            "Scheme Name": scheme_name,
-                            "Applied Date": scheme.get("applied_date", "").split("T")[0],
-                            "Status Details": scheme_status_text,
-                        }
-                        if reasons_list:
-                            info_block["Rejection Reasons"] = "; ".join(reasons_list)
-                        final_schemes_info.append(info_block)
-
-                    except Exception as se:
-                        print(f"[EXT-API] Error fetching status for {scheme_name}: {se}")
-                        final_schemes_info.append({
-                            "Scheme Name": scheme_name,
-                            "Status": "Could not fetch real-time status.",
-                        })
-
-                aggregated_data["schemes"] = {"data": final_schemes_info}
-                print("[EXT-API] Schemes processed successfully.")
+                    stored_dt, stored_scheme = stored
+                    if stored_dt is None:
+                        stored_dt = _applied_date(stored_scheme, s_id)
+                    current_dt = _applied_date(scheme, s_id)
+                    if current_dt > stored_dt:
+                        unique_schemes[s_id] = (current_dt, scheme)
+                    elif stored[0] is None:
+                        unique_schemes[s_id] = (stored_dt, stored_scheme)
+
+                processed_list = [scheme for _, scheme in unique_schemes.values()]
+                logger.debug("Unique schemes count: %d", len(processed_list))
+
+                # Step 2 & 3: Fetch Status and Rejection Reasons for every
+                # scheme concurrently (results keep processed_list order),
+                # at most EXTERNAL_API_FANOUT requests at a time for this user
+                fanout = asyncio.Semaphore(settings.EXTERNAL_API_FANOUT)
+                final_schemes_info = await asyncio.gather(*(
+                    _fetch_scheme_status(client, scheme, fanout)
+                    for scheme in processed_list
+                ))
+
+                result["schemes"] = {"data": final_schemes_info}
+                logger.debug("Schemes processed successfully")
         else:
-            aggregated_data["schemes_error"] = resp.text
-            print("[EXT-API] ERROR: Failed to fetch schemes data.")
+            result["schemes_error"] = resp.text
+            logger.warning("Failed to fetch schemes data (HTTP %s)", resp.status_code)
 
     except Exception as e:
-        aggregated_data["schemes_error"] = str(e)
-        print(f"[EXT-API] EXCEPTION while fetching schemes: {e}")
+        result["schemes_error"] = str(e)
+        logger.warning("Exception while fetching schemes: %s", e, exc_info=True)
+
+    return result
+
+
+def _applied_date(scheme: dict, s_id) -> datetime:
+    """Parsed applied_date of a scheme row, or datetime.min if absent or invalid."""
+    app_date_str = scheme.get("applied_date")
+    if app_date_str:
+        try:
+            return _parse_iso(app_date_str)
+        except Exception as e:
+            logger.warning("Date parse error for scheme %s: %s", s_id, e)
+    return datetime.min
+
 
-    # ------------------------------------------------------------------
-    # 2. Get Renewal Date
-    # ------------------------------------------------------------------
+async def _fetch_renewal_date(
+    client: httpx.AsyncClient, headers: httpx.Headers, user_id: str
+) -> dict:
+    """Get Renewal Date."""
+    result: dict = {}
     try:
-        url = f"{base_url}/user/get-renewal-date"
+        url = _URL_RENEWAL_DATE
         payload = {"user_id": str(user_id)}
 
-        print(f"[EXT-API] RENEWAL DATE API CALL: {url}")
-        resp = await client.post(url, headers=headers, json=payload, timeout=10)
-        print(f"[EXT-API] Renewal HTTP Status: {resp.status_code}")
+        logger.debug("Renewal date API call: %s", url)
+        resp = await _send(
+            client, url, headers=headers, content=orjson.dumps(payload), timeout=_TOP_TIMEOUT
+        )
+        logger.debug("Renewal HTTP status: %s (%s)", resp.status_code, resp.http_version)
 
         if resp.status_code == 200:
-            aggregated_data["renewal_date"] = resp.json()
-            print("[EXT-API] Renewal date fetched.")
+            result["renewal_date"] = orjson.loads(resp.content)
+            logger.debug("Renewal date fetched")
         else:
-            aggregated_data["renewal_date_error"] = resp.text
-            print("[EXT-API] ERROR: Failed to fetch renewal date.")
+            result["renewal_date_error"] = resp.text
+            logger.warning("Failed to fetch renewal date (HTTP %s)", resp.status_code)
 
     except Exception as e:
-        aggregated_data["renewal_date_error"] = str(e)
-        print(f"[EXT-API] EXCEPTION while fetching renewal date: {e}")
+        result["renewal_date_error"] = str(e)
+        logger.warning("Exception while fetching renewal date: %s", e, exc_info=True)
+
+
+    return result
+
 
-    # ------------------------------------------------------------------
-    # 3. Get User Registration Details (Enhanced Processing)
-    # ------------------------------------------------------------------
+async def _fetch_registration_details(
+    client: httpx.AsyncClient,
+    headers: httpx.Headers,
+    user_id: str,
+    schemes: "asyncio.Future[dict]",
+) -> dict:
+    """Get User Registration Details (Enhanced Processing)."""
+    result: dict = {}
     try:
-        url = f"{base_url}/user/get-user-registration-details"
+        url = _URL_REG_DETAILS
         payload = {
             "key": "user_id",
             "value": str(user_id),
@@ -217,15 +540,18 @@ async def fetch_user_data(
             "procedure_name": "all",
         }
 
-        print(f"[EXT-API] REGISTRATION DETAILS API CALL: {url}")
-        resp = await client.post(url, headers=headers, json=payload, timeout=10)
-        print(f"[EXT-API] Registration HTTP Status: {resp.status_code}")
+        logger.debug("Registration details API call: %s", url)
+        resp = await _send(
+            client, url, headers=headers, content=orjson.dumps(payload), timeout=_TOP_TIMEOUT
+        )
+        logger.debug("Registration HTTP status: %s (%s)", resp.status_code, resp.http_version)
 
         if resp.status_code == 200:
-            reg_resp_data = resp.json()
+            reg_resp_data = orjson.loads(resp.content)
 
             reg_code = None
             full_registration_data = {}
+            personal = None
 
             if reg_resp_data.get("success"):
                 data_block = reg_resp_data.get("data", {})
@@ -235,219 +561,38 @@ async def fetch_user_data(
                         personal = personal_list[0]
                         reg_code = personal.get("registration_code")
 
-                        # --- Enhanced Data Extraction ---
-                        try:
-                            # 1. Personal Details
-                            dob_str = personal.get("date_of_birth")
-                            dob = None
-                            age = None
-                            if dob_str:
-                                try:
-                                    dob_dt = datetime.fromisoformat(
-                                        dob_str.replace("Z", "+00:00")
-                                    )
-                                    dob = dob_dt.strftime("%Y-%m-%d")
-                                    today = datetime.now(dob_dt.tzinfo)
-                                    age = (today - dob_dt).days // 365
-                                except Exception as e:
-                                    print(f"[EXT-API] Error parsing DOB: {e}")
-
-                            validity_to_str = personal.get("validity_to_date")
-                            validity_from_str = personal.get("validity_from_date")
-                            validity_status = "Unknown"
-
-                            is_active = False
-                            is_buffer = False
-                            current_dt = datetime.now()
-
-                            if validity_to_str:
-                                try:
-                                    val_to_dt = datetime.fromisoformat(
-                                        validity_to_str.replace("Z", "+00:00")
-                                    )
-                                    current_dt = datetime.now(val_to_dt.tzinfo)
-
-                                    one_year_later = val_to_dt + timedelta(days=365)
-                                    inactive_end = one_year_later + timedelta(days=90)
-
-                                    if current_dt <= val_to_dt:
-                                        validity_status = "Active"
-                                        is_active = True
-                                    elif current_dt <= one_year_later:
-                                        validity_status = "Active (Buffer Period)"
-                                        is_buffer = True
-                                    elif current_dt <= inactive_end:
-                                        validity_status = "Inactive (Waiting Period)"
-                                    else:
-                                        validity_status = "Expired (Re-registration Required)"
-                                except Exception as e:
-                                    print(f"[EXT-API] Error calculating validity: {e}")
-
-                            # Scheme Eligibility Logic
-                            eligible_schemes = []
-                            try:
-                                existing_schemes = aggregated_data.get("schemes", {})
-                                if isinstance(existing_schemes, dict):
-                                    existing_schemes = existing_schemes.get("data", [])
-                                else:
-                                    existing_schemes = []
-
-                                pension_approved = False
-                                disability_approved = False
-                                disability_applied_date = None
-
-                                if isinstance(existing_schemes, list):
-                                    for s in existing_schemes:
-                                        s_name = s.get("Scheme Name", "").lower()
-                                        s_status = s.get("Status Details", "").lower()
-                                        s_date = s.get("Applied Date", "")
-
-                                        if "approved" in s_status:
-                                            if "pension" in s_name:
-                                                pension_approved = True
-                                            if "disability" in s_name:
-                                                disability_approved = True
-                                                if s_date:
-                                                    try:
-                                                        disability_applied_date = datetime.strptime(
-                                                            s_date, "%Y-%m-%d"
-                                                        )
-                                                        if current_dt.tzinfo:
-                                                            disability_applied_date = (
-                                                                disability_applied_date.replace(
-                                                                    tzinfo=current_dt.tzinfo
-                                                                )
-                                                            )
-                                                    except Exception:
-                                                        pass
-
-                                # Rules (exact same as working user_service.py)
-                                if is_active or is_buffer:
-                                    eligible_schemes.append("Accident Compensation")
-                                    eligible_schemes.append("Funeral Assistance")
-
-                                if is_active:
-                                    eligible_schemes.append("Medical Assistance")
-                                    eligible_schemes.append("Major Ailments Assistance")
-
-                                val_from_year = 9999
-                                if validity_from_str:
-                                    try:
-                                        val_from_dt = datetime.fromisoformat(
-                                            validity_from_str.replace("Z", "+00:00")
-                                        )
-                                        val_from_year = val_from_dt.year
-                                    except Exception:
-                                        pass
-
-                                current_year = current_dt.year
-                                gender = personal.get("gender", "").lower()
-
-                                if current_year > val_from_year:
-                                    eligible_schemes.append("Marriage Assistance")
-
-                                if current_year > val_from_year and gender == "female":
-                                    eligible_schemes.append("Maternity Assistance (Delivery)")
-                                    eligible_schemes.append("Thayi Magu Assistance")
-
-                                if age is not None and age >= 60:
-                                    eligible_schemes.append("Pension Scheme")
-
-                                if age is not None and age > 60 and pension_approved:
-                                    eligible_schemes.append("Continuation of Pension")
-
-                                eligible_schemes.append("Disability Pension")
-
-                                if disability_approved and disability_applied_date:
-                                    one_year_after = disability_applied_date + timedelta(days=365)
-                                    if current_dt > one_year_after:
-                                        eligible_schemes.append(
-                                            "Continuation of Disability Pension"
-                                        )
-
-                            except Exception as e:
-                                print(f"[EXT-API] Error calculating eligibility: {e}")
-                                eligible_schemes.append("Error calculating schemes")
-
-                            extracted_personal = {
-                                "first_name": personal.get("first_name"),
-                                "last_name": personal.get("last_name"),
-                                "registration_code": reg_code,
-                                "mobile_no": personal.get("mobile_no"),
-                                "marital_status": personal.get("marital_status"),
-                                "date_of_birth": dob,
-                                "age": age,
-                                "nature_of_work": personal.get(
-                                    "nature_of_work", "Labour Work"
-                                ),
-                                "gender": personal.get("gender"),
-                                "is_approved": personal.get("is_approved"),
-                                "approved_date": personal.get("approved_date"),
-                                "validity_from_date": personal.get("validity_from_date"),
-                                "validity_to_date": personal.get("validity_to_date"),
-                                "calculated_status": validity_status,
-                                "eligible_schemes": eligible_schemes,
-                            }
-
-                            print(f"[EXT-API] Extracted personal: name={extracted_personal['first_name']}, "
-                                  f"age={age}, gender={personal.get('gender')}, "
-                                  f"status={validity_status}")
-                            print(f"[EXT-API] Eligible schemes: {eligible_schemes}")
-
-                            # 2. Address Details
-                            address_list = data_block.get("address_details", [])
-                            district = None
-                            if address_list:
-                                district = address_list[0].get("district")
-                            extracted_address = {"district": district}
-
-                            # 3. Family Details (Dependents & Nominees)
-                            family_list = data_block.get("family_details", [])
-                            dependents = []
-                            nominees = []
-
-                            for member in family_list:
-                                member_info = {
-                                    "relation": member.get("parent_child_relation"),
-                                    "first_name": member.get("first_name"),
-                                    "last_name": member.get("last_name"),
-                                }
-                                dependents.append(member_info)
-                                if member.get("is_nominee"):
-                                    nominees.append(member_info)
-
-                            full_registration_data = {
-                                "personal_details": extracted_personal,
-                                "address_details": extracted_address,
-                                "family_details": dependents,
-                                "nominees": nominees,
-                            }
-
-                            print(f"[EXT-API] Family: {len(dependents)} dependents, "
-                                  f"{len(nominees)} nominees")
-
-                        except Exception as e:
-                            print(f"[EXT-API] Error extracting details: {e}")
-                            full_registration_data = {}
-
             # Check registration/renewal status
             final_reg_status = "Registration details not found."
 
             if reg_code:
-                print(f"[EXT-API] Found reg code: {reg_code}. Checking status...")
+                logger.debug("Found reg code %s, checking status", reg_code)
 
-                status_url = f"{base_url}/public/labour/status"
+                status_url = _URL_LABOUR_STATUS
                 reg_status_payload = {
                     "type": "register",
                     "applicationNumber": reg_code,
                     "mobileNumber": "",
                 }
+                ren_payload = {
+                    "type": "renewal",
+                    "applicationNumber": reg_code,
+                    "mobileNumber": "",
+                }
+                # The renewal lookup is only needed when registration is
+                # approved (the common case), but its payload is already
+                # known, so it is sent alongside the registration lookup.
+                # The wait on it is cancelled on every other path, including
+                # this section's own cancellation at the deadline; being
+                # shielded in _shared_json, the call itself is unaffected.
+                renewal = asyncio.ensure_future(
+                    _shared_json(client, status_url, ren_payload)
+                )
+                renewal.add_done_callback(_discard_outcome)
 
                 try:
-                    r_stat_resp = await client.post(
-                        status_url, json=reg_status_payload, timeout=5
+                    r_stat_data = await _shared_json(
+                        client, status_url, reg_status_payload
                     )
-                    r_stat_data = r_stat_resp.json()
 
                     if r_stat_data.get("success") and r_stat_data.get("data"):
                         r_data = r_stat_data["data"]
@@ -458,16 +603,8 @@ async def fetch_user_data(
                         final_reg_status = f"Registration Status: {status_str}."
 
                         if status_str == "Approved":
-                            print("[EXT-API] Registration Approved. Checking Renewal...")
-                            ren_payload = {
-                                "type": "renewal",
-                                "applicationNumber": reg_code,
-                                "mobileNumber": "",
-                            }
-                            ren_resp = await client.post(
-                                status_url, json=ren_payload, timeout=5
-                            )
-                            ren_data_full = ren_resp.json()
+                            logger.debug("Registration approved, checking renewal")
+                            ren_data_full = await renewal
 
                             if ren_data_full.get("success") and ren_data_full.get("data"):
                                 ren_data = ren_data_full["data"]
@@ -477,75 +614,465 @@ async def fetch_user_data(
                                 final_reg_status += f" Renewal Status: {ren_status_str}."
 
                                 if ren_status_str == "Rejected":
-                                    print("[EXT-API] Renewal Rejected. Fetching reason...")
+                                    logger.debug("Renewal rejected, fetching reason")
                                     reasons = await _fetch_rejection_reasons(
-                                        client, base_url, headers,
+                                        client, headers,
                                         labour_user_id_stat, ren_cert_id,
                                     )
                                     if reasons:
                                         final_reg_status += f" (Reason: {'; '.join(reasons)})"
 
                         elif status_str == "Rejected":
-                            print("[EXT-API] Registration Rejected. Fetching reason...")
+                            logger.debug("Registration rejected, fetching reason")
                             reasons = await _fetch_rejection_reasons(
-                                client, base_url, headers,
+                                client, headers,
                                 labour_user_id_stat, cert_id,
                             )
                             if reasons:
                                 final_reg_status += f" (Reason: {'; '.join(reasons)})"
 
                 except Exception as ex:
-                    print(f"[EXT-API] Error checking reg status: {ex}")
+                    logger.warning("Error checking registration status: %s", ex)
                     final_reg_status += " (verification failed)"
+                finally:
+                    renewal.cancel()
             else:
-                print("[EXT-API] Registration Code not found.")
+                logger.debug("Registration code not found")
+
+            # Eligibility depends on the processed schemes, so extraction
+            # waits for that call only after the status checks are done
+            if personal is not None:
+                existing_schemes = (await schemes).get("schemes")
+                full_registration_data = _extract_registration_data(
+                    personal, data_block, reg_code, existing_schemes
+                )
 
             # Merge summary + personal/family data (critical!)
-            aggregated_data["registration_details"] = {
+            result["registration_details"] = {
                 "summary": final_reg_status,
                 **full_registration_data,
             }
-            print(f"[EXT-API] Registration details stored. Keys: "
-                  f"{list(aggregated_data['registration_details'].keys())}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Registration details stored. Keys: %s",
+                    list(result["registration_details"].keys()),
+                )
 
         else:
-            aggregated_data["registration_details_error"] = resp.text
-            print("[EXT-API] ERROR: Failed to fetch registration details.")
+            result["registration_details_error"] = resp.text
+            logger.warning("Failed to fetch registration details (HTTP %s)", resp.status_code)
 
     except Exception as e:
-        aggregated_data["registration_details_error"] = str(e)
-        print(f"[EXT-API] EXCEPTION while fetching registration details: {e}")
+        result["registration_details_error"] = str(e)
+        logger.warning("Exception while fetching registration details: %s", e, exc_info=True)
 
-    aggregated_data["fetch_status"] = "completed"
-    print(f"[EXT-API] DATA AGGREGATION COMPLETED for user {user_id}")
+    return result
 
-    return aggregated_data
+
+def _extract_registration_data(
+    personal: dict, data_block: dict, reg_code: str | None, existing_schemes
+) -> dict:
+    """Extract personal, address and family details and compute eligibility."""
+    try:
+        # 1. Personal Details
+        # One clock reading shared by the age, validity and eligibility rules
+        now_utc = datetime.now(timezone.utc)
+        dob, age = _parse_dob(personal.get("date_of_birth"), now_utc)
+        validity_status, is_active, is_buffer, current_dt = _compute_validity(
+            personal.get("validity_to_date"), now_utc
+        )
+        eligible_schemes = _compute_eligibility(
+            personal, existing_schemes, age, is_active, is_buffer, current_dt
+        )
+
+        extracted_personal = {
+            "first_name": personal.get("first_name"),
+            "last_name": personal.get("last_name"),
+            "registration_code": reg_code,
+            "mobile_no": personal.get("mobile_no"),
+            "marital_status": personal.get("marital_status"),
+            "date_of_birth": dob,
+            "age": age,
+            "nature_of_work": personal.get(
+                "nature_of_work", "Labour Work"
+            ),
+            "gender": personal.get("gender"),
+            "is_approved": personal.get("is_approved"),
+            "approved_date": personal.get("approved_date"),
+            "validity_from_date": personal.get("validity_from_date"),
+            "validity_to_date": personal.get("validity_to_date"),
+            "calculated_status": validity_status,
+            "eligible_schemes": eligible_schemes,
+        }
+
+        logger.debug(
+            "Extracted personal: name=%s, age=%s, gender=%s, status=%s",
+            extracted_personal["first_name"], age, personal.get("gender"),
+            validity_status,
+        )
+        logger.debug("Eligible schemes: %s", eligible_schemes)
+
+        # 2. Address Details
+        address_list = data_block.get("address_details", [])
+        district = None
+        if address_list:
+            district = address_list[0].get("district")
+        extracted_address = {"district": district}
+
+        # 3. Family Details (Dependents & Nominees)
+        dependents, nominees = _extract_family(data_block.get("family_details", []))
+        logger.debug("Family: %d dependents, %d nominees", len(dependents), len(nominees))
+    except (AttributeError, TypeError, KeyError, IndexError) as e:
+        # Malformed personal/address/family blocks
+        logger.warning("Error extracting details: %s", e)
+        return {}
+
+    return {
+        "personal_details": extracted_personal,
+        "address_details": extracted_address,
+        "family_details": dependents,
+        "nominees": nominees,
+    }
+
+
+def _now_in(now_utc: datetime, tz: tzinfo | None) -> datetime:
+    """``now_utc`` as datetime.now(tz) would return it (naive local if tz is None)."""
+    if tz is None:
+        return now_utc.astimezone().replace(tzinfo=None)
+    return now_utc.astimezone(tz)
+
+
+def _parse_dob(
+    dob_str: str | None, now_utc: datetime
+) -> tuple[str | None, int | None]:
+    """Return the date of birth as YYYY-MM-DD and the age in whole years."""
+    if not dob_str:
+        return None, None
+    try:
+        dob_dt = _parse_iso(dob_str)
+    except (TypeError, ValueError) as e:
+        logger.warning("Error parsing DOB: %s", e)
+        return None, None
+    today = _now_in(now_utc, dob_dt.tzinfo)
+    return dob_dt.strftime("%Y-%m-%d"), (today - dob_dt).days // 365
+
+
+def _compute_validity(
+    validity_to_str: str | None, now_utc: datetime
+) -> tuple[str, bool, bool, datetime]:
+    """Classify the registration validity window.
+
+    Returns (status, is_active, is_buffer, now), where ``now`` is in the
+    validity date's timezone so later comparisons stay consistent.
+    """
+    current_dt = _now_in(now_utc, None)
+    if not validity_to_str:
+        return "Unknown", False, False, current_dt
+
+    try:
+        val_to_dt = _parse_iso(validity_to_str)
+        current_dt = _now_in(now_utc, val_to_dt.tzinfo)
+        passed = (
+            (current_dt > val_to_dt)
+            + (current_dt > val_to_dt + _ONE_YEAR)
+            + (current_dt > val_to_dt + _WAITING_PERIOD_END)
+        )
+    except (TypeError, ValueError, OverflowError) as e:
+        logger.warning("Error calculating validity: %s", e)
+        return "Unknown", False, False, current_dt
+
+    return (*_VALIDITY_STATES[passed], current_dt)
+
+
+def _compute_eligibility(
+    personal: dict,
+    existing_schemes,
+    age: int | None,
+    is_active: bool,
+    is_buffer: bool,
+    current_dt: datetime,
+) -> list[str]:
+    """Scheme Eligibility Logic."""
+    eligible_schemes = []
+    try:
+        if isinstance(existing_schemes, dict):
+            existing_schemes = existing_schemes.get("data", [])
+        else:
+            existing_schemes = []
+
+        pension_approved = False
+        disability_approved = False
+        disability_applied_date = None
+
+        if isinstance(existing_schemes, list):
+            for s in existing_schemes:
+                # Only approved schemes matter, so the name is scanned
+                # just for those rows
+                if not _APPROVED_RE.search(s.get("Status Details") or ""):
+                    continue
+
+                s_keywords = {
+                    keyword.casefold() for keyword in
+                    _ELIGIBILITY_KEYWORD_RE.findall(s.get("Scheme Name") or "")
+                }
+                if "pension" in s_keywords:
+                    pension_approved = True
+                if "disability" in s_keywords:
+                    disability_approved = True
+                    s_date = s.get("Applied Date")
+                    if s_date:
+                        try:
+                            disability_applied_date = _parse_ymd(s_date)
+                        except (TypeError, ValueError):
+                            pass
+                        else:
+                            if current_dt.tzinfo:
+                                disability_applied_date = (
+                                    disability_applied_date.replace(
+                                        tzinfo=current_dt.tzinfo
+                                    )
+                                )
+
+        # Rules (exact same as working user_service.py)
+        if is_active or is_buffer:
+            eligible_schemes.extend(("Accident Compensation", "Funeral Assistance"))
+
+        if is_active:
+            eligible_schemes.extend(("Medical Assistance", "Major Ailments Assistance"))
+
+        val_from_year = 9999
+        validity_from_str = personal.get("validity_from_date")
+        if validity_from_str:
+            try:
+                val_from_year = _parse_iso(validity_from_str).year
+            except (TypeError, ValueError):
+                pass
+
+        current_year = current_dt.year
+        gender = personal.get("gender", "").lower()
+
+        if current_year > val_from_year:
+            eligible_schemes.append("Marriage Assistance")
+            if gender == "female":
+                eligible_schemes.extend(
+                    ("Maternity Assistance (Delivery)", "Thayi Magu Assistance")
+                )
+
+        if age is not None and age >= 60:
+            eligible_schemes.append("Pension Scheme")
+            if age > 60 and pension_approved:
+                eligible_schemes.append("Continuation of Pension")
+
+        eligible_schemes.append("Disability Pension")
+
+        if disability_approved and disability_applied_date:
+            one_year_after = disability_applied_date + _ONE_YEAR
+            if current_dt > one_year_after:
+                eligible_schemes.append(
+                    "Continuation of Disability Pension"
+                )
+
+    except (AttributeError, TypeError, ValueError, OverflowError) as e:
+        # Malformed scheme rows or personal fields
+        logger.warning("Error calculating eligibility: %s", e)
+        eligible_schemes.append("Error calculating schemes")
+
+    return eligible_schemes
+
+
+def _extract_family(family_list: list) -> tuple[list[dict], list[dict]]:
+    """Return (dependents, nominees) from the family details block."""
+    dependents = []
+    nominees = []
+    for member in family_list:
+        member_info = {
+            "relation": member.get("parent_child_relation"),
+            "first_name": member.get("first_name"),
+            "last_name": member.get("last_name"),
+        }
+        dependents.append(member_info)
+        if member.get("is_nominee"):
+            nominees.append(member_info)
+    return dependents, nominees
+
+
+def _discard_outcome(task: asyncio.Future) -> None:
+    """Done callback for speculative requests whose result may go unused.
+
+    Retrieves the exception so an unawaited failure is not reported as
+    "exception was never retrieved".
+    """
+    if not task.cancelled():
+        task.exception()
+
+
+async def _shared_json(
+    client: httpx.AsyncClient, url: str, payload: dict | None = None
+) -> Any:
+    """GET ``url`` (or POST ``payload`` to it) and return the decoded body.
+
+    Identical concurrent requests share one upstream call. The call runs
+    as its own task and every caller, including the one that started it,
+    awaits it through asyncio.shield, so a caller's cancellation (e.g. its
+    fetch_user_data deadline) never cancels the call for the others.
+    """
+    key = (url, orjson.dumps(payload, option=orjson.OPT_SORT_KEYS))
+    inflight = _loop_state().inflight
+    task = inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(_request_json(client, url, payload))
+        inflight[key] = task
+        task.add_done_callback(functools.partial(_forget_inflight, inflight, key))
+        # Marks the outcome retrieved when every waiter was cancelled
+        task.add_done_callback(_discard_outcome)
+    return await asyncio.shield(task)
+
+
+def _forget_inflight(
+    inflight: dict[tuple, asyncio.Task], key: tuple, task: asyncio.Future
+) -> None:
+    """Done callback removing a finished call from its loop's in-flight map."""
+    if inflight.get(key) is task:
+        del inflight[key]
+
+
+async def _request_json(
+    client: httpx.AsyncClient, url: str, payload: dict | None
+) -> Any:
+    """The upstream call behind _shared_json."""
+    try:
+        resp = await _send(
+            client,
+            url,
+            headers=None if payload is None else _JSON_HEADERS,
+            content=None if payload is None else orjson.dumps(payload),
+            timeout=_SUB_TIMEOUT,
+        )
+    except httpx.PoolTimeout:
+        logger.warning("Connection pool exhausted waiting to request %s", url)
+        raise
+    # Error pages (often HTML from a proxy) are never used, so they
+    # fail here without being decoded
+    resp.raise_for_status()
+    return orjson.loads(resp.content)
+
+
+async def _cached_json(
+    client: httpx.AsyncClient, url: str, payload: dict | None = None
+) -> Any:
+    """Like _shared_json, but bodies with ``"success": true`` are cached
+    for _RESPONSE_CACHE_TTL seconds.
+    """
+    key = (url, orjson.dumps(payload, option=orjson.OPT_SORT_KEYS))
+    entry = _response_cache.get(key)
+    if entry is not None and time.monotonic() - entry[0] < _RESPONSE_CACHE_TTL:
+        return entry[1]
+
+    data = await _shared_json(client, url, payload)
+    if isinstance(data, dict) and data.get("success"):
+        _response_cache.pop(key, None)
+        _response_cache[key] = (time.monotonic(), data)
+        if len(_response_cache) > _RESPONSE_CACHE_MAX:
+            _response_cache.pop(next(iter(_response_cache)))
+    return data
+
+
+async def _fetch_scheme_status(
+    client: httpx.AsyncClient,
+    scheme: dict,
+    fanout: asyncio.Semaphore,
+) -> dict:
+    """Fetch the live status (and rejection reasons, if rejected) of one scheme application."""
+    scheme_id = scheme.get("scheme_id")
+    app_code = scheme.get("scheme_application_code")
+    scheme_name = scheme.get("scheme_name", "Unknown Scheme")
+
+    logger.debug("Fetching status for %s (%s)", scheme_name, app_code)
+
+    status_url = _URL_SCHEME_STATUS
+    status_payload = {
+        "schemeId": scheme_id,
+        "schemeApplicationCode": app_code,
+        "mobileNumber": "",
+    }
+
+    try:
+        if app_code:
+            async with fanout:
+                status_data_full = await _cached_json(client, status_url, status_payload)
+        else:
+            # No application code to look up: skip the round trip and report
+            # the failed check the backend would return
+            status_data_full = {}
+        status_success = status_data_full.get("success", False)
+        status_items = status_data_full.get("data", [])
+
+        scheme_status_text = "Status check failed"
+        reasons_list = []
+
+        if status_success and status_items:
+            item = status_items[0]
+            application_status = item.get("application_status")
+            full_status_desc = item.get("status")
+            avail_id = item.get("id")
+
+            scheme_status_text = (
+                f"Application Status: {application_status}. "
+                f"({full_status_desc})"
+            )
+
+            if application_status == "Rejected" and avail_id:
+                logger.debug("Scheme rejected, fetching reason for ID %s", avail_id)
+                reason_url = f"{_URL_REJECTION_REASON}?availId={avail_id}&reasonType=FINAL"
+                try:
+                    async with fanout:
+                        r_data = await _cached_json(client, reason_url)
+                    if r_data.get("success"):
+                        for r in r_data.get("data", []):
+                            if r.get("rejection_reason"):
+                                reasons_list.append(r["rejection_reason"])
+                except Exception as re:
+                    logger.warning("Error fetching rejection reason: %s", re)
+
+        info_block = {
+            "Scheme Name": scheme_name,
+            "Applied Date": scheme.get("applied_date", "").partition("T")[0],
+            "Status Details": scheme_status_text,
+        }
+        if reasons_list:
+            info_block["Rejection Reasons"] = "; ".join(reasons_list)
+        return info_block
+
+    except Exception as se:
+        logger.warning("Error fetching status for %s: %s", scheme_name, se)
+        return {
+            "Scheme Name": scheme_name,
+            "Status": "Could not fetch real-time status.",
+        }
 
 
 async def _fetch_rejection_reasons(
     client: httpx.AsyncClient,
-    base_url: str,
-    headers: dict[str, str],
+    headers: httpx.Headers,
     labour_user_id,
     certificate_id,
 ) -> list[str]:
     """Fetch rejection reasons for registration/renewal."""
     reasons = []
     try:
-        rej_url = f"{base_url}/public/v2/registration-renewal/rejection-reason"
+        rej_url = _URL_REG_REJECTION
         rej_payload = {
             "labourUserId": labour_user_id,
             "certificateId": certificate_id,
             "reasonType": "FINAL",
         }
-        rej_resp = await client.post(rej_url, json=rej_payload, timeout=5)
-        rej_data_full = rej_resp.json()
+        rej_data_full = await _cached_json(client, rej_url, rej_payload)
 
         if rej_data_full.get("success"):
             for r in rej_data_full.get("data", []):
                 if r.get("rejection_reason"):
                     reasons.append(r["rejection_reason"])
     except Exception as e:
-        print(f"[EXT-API] Error fetching rejection reason: {e}")
+        logger.warning("Error fetching rejection reason: %s", e)
 
     return reasons
@@ -1,10 +1,14 @@
 import asyncio
+import hashlib
+import itertools
 import logging
 import uuid
+from collections.abc import AsyncIterator, Iterator
+from contextlib import closing
 
 from qdrant_client.models import PointStruct
 
-from app.chunker import chunk_markdown
+from app.chunker import iter_chunks
 from app.config import settings
 from app.ollama_client import default_ollama
 from app.qdrant_service import create_collection, get_qdrant_client
@@ -12,84 +16,156 @@ from app.qdrant_service import create_collection, get_qdrant_client
 logger = logging.getLogger(__name__)
 
 
-async def _embed_chunk(
-    index: int,
-    chunk: str,
-    semaphore: asyncio.Semaphore,
-) -> PointStruct | None:
-    """Embed a single chunk, respecting the concurrency semaphore."""
-    async with semaphore:
-        try:
-            vector = await default_ollama.embed(chunk)
-            return PointStruct(
-                id=str(uuid.uuid4()),
-                vector=vector,
-                payload={"text": chunk},
-            )
-        except Exception:
-            logger.error("Failed to embed chunk %d, skipping", index, exc_info=True)
-            return None
+def _point_id(chunk: str) -> str:
+    """Content-addressed point ID, so the same chunk text always maps to the same point."""
+    digest = hashlib.blake2b(chunk.encode("utf-8"), digest_size=16).digest()
+    return str(uuid.UUID(bytes=digest))
 
 
-async def ingest() -> None:
-    data_path = settings.DATA_PATH
-    logger.info("Reading data from %s", data_path)
+def _unique_chunks(chunks: Iterator[str]) -> Iterator[tuple[str, str]]:
+    """Yield (point_id, chunk) pairs, dropping chunks already seen this run."""
+    seen: set[str] = set()
+    duplicates = 0
+    for chunk in chunks:
+        point_id = _point_id(chunk)
+        if point_id in seen:
+            duplicates += 1
+            continue
+        seen.add(point_id)
+        yield point_id, chunk
+    if duplicates:
+        logger.info("Skipped %d duplicate chunks", duplicates)
 
-    try:
-        with open(data_path, "r", encoding="utf-8") as f:
-            content = f.read()
-    except FileNotFoundError:
-        logger.error("Data file not found: %s", data_path)
-        raise
-    except Exception:
-        logger.error("Failed to read data file: %s", data_path, exc_info=True)
-        raise
 
-    chunks = chunk_markdown(content)
-    logger.info("Produced %d chunks from input file", len(chunks))
+async def _aiter_batches(
+    chunks: Iterator[tuple[str, str]], size: int,
+) -> AsyncIterator[list[tuple[str, str]]]:
+    """Yield lists of up to size chunks, reading and chunking in a worker thread.
 
-    client = get_qdrant_client()
-    try:
-        # Recreate collection to remove old chunks
-        if await client.collection_exists(settings.COLLECTION_NAME):
-            logger.info("Deleting existing collection '%s'", settings.COLLECTION_NAME)
-            await client.delete_collection(settings.COLLECTION_NAME)
-
-        await create_collection(client)
-
-        # Embed all chunks concurrently with bounded parallelism
-        semaphore = asyncio.Semaphore(settings.INGEST_CONCURRENCY)
-        tasks = [
-            _embed_chunk(i, chunk, semaphore) for i, chunk in enumerate(chunks)
-        ]
-        results = await asyncio.gather(*tasks)
-
-        # Filter out failed embeddings (None values)
-        points = [r for r in results if r is not None]
-        failed_count = len(results) - len(points)
-        if failed_count > 0:
-            logger.warning(
-                "%d of %d chunks failed to embed and were skipped",
-                failed_count, len(results),
-            )
+    The event loop keeps driving in-flight embed requests while the next
+    batch is being read.
+    """
+    def next_batch() -> list[tuple[str, str]]:
+        return list(itertools.islice(chunks, size))
 
-        if not points:
-            logger.warning("No chunks were embedded successfully; nothing to ingest")
-            return
+    while batch := await asyncio.to_thread(next_batch):
+        yield batch
 
-        await client.upsert(
-            collection_name=settings.COLLECTION_NAME,
-            points=points,
-        )
 
-        logger.info(
-            "Ingested %d chunks into collection '%s'",
-            len(points),
-            settings.COLLECTION_NAME,
+async def _embed_batch(
+    start: int, batch: list[tuple[str, str]],
+) -> list[PointStruct]:
+    """Embed a batch of (point_id, chunk) pairs in one request.
+
+    A failed batch is logged and skipped as a whole.
+    """
+    try:
+        vectors = await default_ollama.embed_many([chunk for _, chunk in batch])
+    except Exception:
+        logger.error(
+            "Failed to embed chunks %d-%d, skipping",
+            start, start + len(batch) - 1, exc_info=True,
+        )
+        return []
+    return [
+        PointStruct(
+            id=point_id,
+            vector=vector,
+            payload={"text": chunk},
         )
-    finally:
-        await client.close()
-        await default_ollama.client.aclose()
+        for (point_id, chunk), vector in zip(batch, vectors, strict=True)
+    ]
+
+
+async def ingest() -> None:
+    data_path = settings.DATA_PATH
+    logger.info("Reading data from %s", data_path)
+
+    with closing(iter_chunks(data_path)) as chunks:
+        batches = _aiter_batches(_unique_chunks(chunks), settings.EMBED_BATCH_SIZE)
+        # The first batch is read before the collection is touched so a
+        # missing or unreadable file leaves the existing data in place
+        try:
+            first_batch = await anext(batches, None)
+        except FileNotFoundError:
+            logger.error("Data file not found: %s", data_path)
+            raise
+        except Exception:
+            logger.error("Failed to read data file: %s", data_path, exc_info=True)
+            raise
+
+        client = get_qdrant_client()
+        in_flight: set[asyncio.Task[list[PointStruct]]] = set()
+        try:
+            # Recreate collection to remove old chunks
+            if await client.collection_exists(settings.COLLECTION_NAME):
+                logger.info("Deleting existing collection '%s'", settings.COLLECTION_NAME)
+                await client.delete_collection(settings.COLLECTION_NAME)
+
+            await create_collection(client)
+
+            # Embed EMBED_BATCH_SIZE chunks per request with up to
+            # INGEST_CONCURRENCY requests in flight, upserting finished points
+            # UPSERT_BATCH_SIZE at a time so memory stays bounded by the
+            # batches in flight. Intermediate upserts don't wait for indexing;
+            # the final one does, and Qdrant applies them in order.
+            upsert_size = settings.UPSERT_BATCH_SIZE
+            total = 0
+            ingested = 0
+            buffered: list[PointStruct] = []
+
+            async def flush(points: list[PointStruct], wait: bool) -> None:
+                nonlocal ingested
+                await client.upsert(
+                    collection_name=settings.COLLECTION_NAME,
+                    points=points,
+                    wait=wait,
+                )
+                ingested += len(points)
+
+            async def collect(return_when: str) -> None:
+                nonlocal in_flight, buffered
+                done, in_flight = await asyncio.wait(in_flight, return_when=return_when)
+                for task in done:
+                    buffered.extend(task.result())
+                # Strictly greater, so the final waiting flush is never empty
+                while len(buffered) > upsert_size:
+                    await flush(buffered[:upsert_size], wait=False)
+                    buffered = buffered[upsert_size:]
+
+            batch = first_batch
+            while batch is not None:
+                if len(in_flight) >= settings.INGEST_CONCURRENCY:
+                    await collect(asyncio.FIRST_COMPLETED)
+                in_flight.add(asyncio.create_task(_embed_batch(total, batch)))
+                total += len(batch)
+                batch = await anext(batches, None)
+            if in_flight:
+                await collect(asyncio.ALL_COMPLETED)
+            if buffered:
+                await flush(buffered, wait=True)
+
+            failed_count = total - ingested
+            if failed_count > 0:
+                logger.warning(
+                    "%d of %d chunks failed to embed and were skipped",
+                    failed_count, total,
+                )
+
+            if not ingested:
+                logger.warning("No chunks were embedded successfully; nothing to ingest")
+                return
+
+            logger.info(
+                "Ingested %d chunks into collection '%s'",
+                ingested,
+                settings.COLLECTION_NAME,
+            )
+        finally:
+            for task in in_flight:
+                task.cancel()
+            await client.close()
+            await default_ollama.client.aclose()
 
 
 if __name__ == "__main__":
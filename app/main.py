@@ -13,21 +13,23 @@ import aiosqlite
 import httpx
 from fastapi import Depends, FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from qdrant_client import AsyncQdrantClient
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from app.config import settings
 from app.database import (
-    add_message,
+    ConnectionPool,
+    MessageWriter,
     cleanup_old_data,
-    ensure_thread,
     get_db,
-    get_paginated_thread_messages,
+    get_paginated_thread_messages_json,
     get_recent_thread_messages,
     init_db,
+    optimize_db,
     thread_exists,
 )
+from app.external_api import get_shared_client
 from app.ollama_client import OllamaClient
 from app.qdrant_service import get_qdrant_client
 from app.rag import answer, answer_stream, classify_and_prepare
@@ -181,6 +183,7 @@ async def _periodic_cleanup(app_instance: FastAPI) -> None:
             msgs, cache = await cleanup_old_data(app_instance.state.db)
             if msgs or cache:
                 logger.info("Periodic cleanup: %d messages, %d cache entries removed", msgs, cache)
+            await optimize_db(app_instance.state.db)
         except Exception:
             logger.error("Periodic cleanup failed", exc_info=True)
 
@@ -200,7 +203,7 @@ async def lifespan(app: FastAPI):
         app.state.http_client = httpx.AsyncClient(timeout=settings.OLLAMA_TIMEOUT)
         app.state.ollama = OllamaClient(client=app.state.http_client)
         # Separate client for external Karnataka API (needs verify=False)
-        app.state.ext_http_client = httpx.AsyncClient(timeout=30, verify=False)
+        app.state.ext_http_client = get_shared_client()
         logger.info("Ollama client and external API client created")
     except Exception:
         logger.critical("Failed to create HTTP clients", exc_info=True)
@@ -218,6 +221,10 @@ async def lifespan(app: FastAPI):
     try:
         app.state.db = await get_db()
         await init_db(app.state.db)
+        app.state.message_writer = MessageWriter()
+        app.state.message_writer.start()
+        app.state.read_pool = ConnectionPool()
+        await app.state.read_pool.open()
         logger.info("Database initialized")
     except Exception:
         logger.critical("Failed to initialize database", exc_info=True)
@@ -245,6 +252,8 @@ async def lifespan(app: FastAPI):
         await cleanup_task
     except asyncio.CancelledError:
         pass
+    await app.state.message_writer.close()
+    await app.state.read_pool.close()
     await app.state.db.close()
     await app.state.qdrant.close()
     await app.state.http_client.aclose()
@@ -318,6 +327,14 @@ def get_db_dep() -> aiosqlite.Connection:
     return app.state.db
 
 
+def get_message_writer_dep() -> MessageWriter:
+    return app.state.message_writer
+
+
+def get_read_pool_dep() -> ConnectionPool:
+    return app.state.read_pool
+
+
 def get_thread_lock(thread_id: str) -> asyncio.Lock:
     """Return (or create) an asyncio.Lock for the given thread.
 
@@ -399,19 +416,14 @@ async def get_messages(
     threadId: str,
     limit: int = Query(default=50, ge=1, le=200),
     offset: int = Query(default=0, ge=0),
-    db: aiosqlite.Connection = Depends(get_db_dep),
+    read_pool: ConnectionPool = Depends(get_read_pool_dep),
 ):
     """Retrieve conversation history for a thread with pagination."""
     _validate_thread_id(threadId)
 
-    messages, total = await get_paginated_thread_messages(db, threadId, limit, offset)
-    return {
-        "threadId": threadId,
-        "messages": messages,
-        "total": total,
-        "limit": limit,
-        "offset": offset,
-    }
+    # SQLite renders the whole body, so it is passed through unchanged
+    body = await get_paginated_thread_messages_json(read_pool, threadId, limit, offset)
+    return Response(content=body, media_type="application/json")
 
 
 @app.post(
@@ -423,15 +435,15 @@ async def send_message(
     threadId: str,
     body: MessageRequest,
     db: aiosqlite.Connection = Depends(get_db_dep),
+    writer: MessageWriter = Depends(get_message_writer_dep),
+    read_pool: ConnectionPool = Depends(get_read_pool_dep),
     qdrant: AsyncQdrantClient = Depends(get_qdrant_dep),
     ollama: OllamaClient = Depends(get_ollama_dep),
 ):
     _validate_thread_id(threadId)
     async with get_thread_lock(threadId):
-        await ensure_thread(db, threadId)
-
-        await add_message(
-            db, threadId, "user", body.message,
+        await writer.add(
+            threadId, "user", body.message,
             user_id=body.userId, language=body.language,
         )
         logger.info("User message added to thread %s", threadId)
@@ -445,7 +457,7 @@ async def send_message(
 
         # Fetch recent messages for history (+ 1 to account for the message just added)
         messages = await get_recent_thread_messages(
-            db, threadId, limit=history_limit + 1
+            read_pool, threadId, limit=history_limit + 1
         )
         # Exclude the last message (just added) to form history
         history = messages[:-1] if len(messages) > 1 else None
@@ -481,8 +493,8 @@ async def send_message(
             )
 
         try:
-            await add_message(
-                db, threadId, "assistant", result,
+            await writer.add(
+                threadId, "assistant", result,
                 user_id=body.userId, language=body.language,
             )
         except Exception:
@@ -510,6 +522,8 @@ async def send_message_stream(
     threadId: str,
     body: MessageRequest,
     db: aiosqlite.Connection = Depends(get_db_dep),
+    writer: MessageWriter = Depends(get_message_writer_dep),
+    read_pool: ConnectionPool = Depends(get_read_pool_dep),
     qdrant: AsyncQdrantClient = Depends(get_qdrant_dep),
     ollama: OllamaClient = Depends(get_ollama_dep),
 ):
@@ -518,10 +532,8 @@ async def send_message_stream(
     # Validate thread, save user message, classify intent, and pre-fetch data
     # ALL under the thread lock to prevent race conditions on cache read/write.
     async with get_thread_lock(threadId):
-        await ensure_thread(db, threadId)
-
-        await add_message(
-            db, threadId, "user", body.message,
+        await writer.add(
+            threadId, "user", body.message,
             user_id=body.userId, language=body.language,
         )
         logger.info("User message added to thread %s (stream)", threadId)
@@ -534,7 +546,7 @@ async def send_message_stream(
         )
 
         messages = await get_recent_thread_messages(
-            db, threadId, limit=history_limit + 1
+            read_pool, threadId, limit=history_limit + 1
         )
         history = messages[:-1] if len(messages) > 1 else None
 
@@ -586,8 +598,8 @@ async def send_message_stream(
         assistant_msg_id = None
         try:
             async with get_thread_lock(threadId):
-                assistant_msg_id = await add_message(
-                    db, threadId, "assistant", full_answer,
+                assistant_msg_id = await writer.add(
+                    threadId, "assistant", full_answer,
                     user_id=body.userId, language=body.language,
                 )
         except Exception:
@@ -3,6 +3,7 @@ import logging
 from typing import AsyncIterator, Optional
 
 import httpx
+import orjson
 
 from app.config import settings
 
@@ -10,6 +11,11 @@ logger = logging.getLogger(__name__)
 
 _MAX_RESPONSE_SIZE = settings.MAX_RESPONSE_SIZE
 
+# Embedding responses carry whole vectors, so they are decoded with
+# orjson. Batch requests (ingest chunks, never user input) are encoded with
+# it too and sent as content=.
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
 
 class OllamaClient:
     def __init__(self, client: Optional[httpx.AsyncClient] = None) -> None:
@@ -228,9 +234,9 @@ class OllamaClient:
                     },
                 )
                 response.raise_for_status()
-                return response.json()["embedding"]
+                return orjson.loads(response.content)["embedding"]
             response.raise_for_status()
-            return response.json()["embeddings"][0]
+            return orjson.loads(response.content)["embeddings"][0]
         except httpx.HTTPError as e:
             logger.error("Ollama embed request failed: %s", e)
             raise
@@ -241,5 +247,58 @@ class OllamaClient:
             )
             raise
 
+    async def embed_many(self, texts: list[str]) -> list[list[float]]:
+        """Embed several texts with one /api/embed request.
+
+        Returns one vector per text, in order. Servers without /api/embed
+        get one legacy /api/embeddings request per text instead.
+        """
+        if not texts:
+            return []
+        logger.debug(
+            "embed_many() model=%s texts=%d", self.embed_model, len(texts),
+        )
+        try:
+            response = await self.client.post(
+                f"{self.base_url}/api/embed",
+                headers=_JSON_HEADERS,
+                content=orjson.dumps({
+                    "model": self.embed_model,
+                    "input": texts,
+                }),
+            )
+            if response.status_code == 404:
+                # Straight to the legacy endpoint: embed() would probe
+                # /api/embed again for every text
+                embeddings = []
+                for text in texts:
+                    response = await self.client.post(
+                        f"{self.base_url}/api/embeddings",
+                        headers=_JSON_HEADERS,
+                        content=orjson.dumps({
+                            "model": self.embed_model,
+                            "prompt": text,
+                        }),
+                    )
+                    response.raise_for_status()
+                    embeddings.append(orjson.loads(response.content)["embedding"])
+                return embeddings
+            response.raise_for_status()
+            embeddings = orjson.loads(response.content)["embeddings"]
+            if len(embeddings) != len(texts):
+                raise ValueError(
+                    f"Ollama returned {len(embeddings)} embeddings for {len(texts)} inputs"
+                )
+            return embeddings
+        except httpx.HTTPError as e:
+            logger.error("Ollama embed_many request failed: %s", e)
+            raise
+        except (KeyError, TypeError) as e:
+            logger.error(
+                "Unexpected Ollama embed_many response structure: %s — body: %s",
+                e, response.text[:500],
+            )
+            raise
+
 
 default_ollama = OllamaClient()
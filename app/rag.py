@@ -1,6 +1,7 @@
 import json
 import logging
 import random
+import time
 import unicodedata
 from typing import AsyncIterator, Optional
 
@@ -768,6 +769,15 @@ def _build_status_prompt(user_data: dict, language: str = "") -> str:
 # ---------------------------------------------------------------------------
 # Fetch or retrieve cached user data
 # ---------------------------------------------------------------------------
+# Partial fetches are not written to the database cache, so they are held
+# here briefly instead: a user whose backend section keeps failing would
+# otherwise trigger a full external re-fetch on every message. Oldest entry
+# is evicted once the cap is reached.
+_PARTIAL_USER_DATA_TTL = 60.0
+_PARTIAL_USER_DATA_MAX = 1024
+_partial_user_data: dict[tuple[str, str], tuple[float, dict]] = {}
+
+
 async def _get_or_fetch_user_data(
     db: aiosqlite.Connection,
     http_client: httpx.AsyncClient,
@@ -789,6 +799,11 @@ async def _get_or_fetch_user_data(
         print(f"[DEBUG]   cached keys: {list(cached.keys()) if isinstance(cached, dict) else type(cached)}")
         logger.info("Using cached user data for thread %s, user %s", thread_id, user_id)
         return cached
+    key = (thread_id, user_id)
+    entry = _partial_user_data.get(key)
+    if entry is not None and time.monotonic() - entry[0] < _PARTIAL_USER_DATA_TTL:
+        logger.info("Using recent partial user data for thread %s, user %s", thread_id, user_id)
+        return entry[1]
 
     # 2. Cache miss — fetch from external API
     print(f"[DEBUG]   CACHE MISS — fetching from external API...")
@@ -821,7 +836,17 @@ async def _get_or_fetch_user_data(
     else:
         print(f"[DEBUG]   registration_details: {reg}")
 
-    # 3. Save to DB for future cache hits
+    # 3. Save to DB for future cache hits. A partial fetch (any section
+    # timed out, errored or came back empty) is not persisted; it is kept
+    # in memory for _PARTIAL_USER_DATA_TTL seconds, after which the next
+    # message retries the external API.
+    if data.get("fetch_status") != "completed":
+        logger.info("Not caching partial user data for thread %s, user %s", thread_id, user_id)
+        _partial_user_data.pop(key, None)
+        _partial_user_data[key] = (time.monotonic(), data)
+        if len(_partial_user_data) > _PARTIAL_USER_DATA_MAX:
+            _partial_user_data.pop(next(iter(_partial_user_data)))
+        return data
     try:
         await save_user_data(db, thread_id, user_id, data)
         print(f"[DEBUG]   Data saved to cache")
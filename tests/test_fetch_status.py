@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""fetch_user_data fetch_status tests.
+
+Runs fetch_user_data against an in-process mock of the KBOCWWB backend
+(httpx.MockTransport), so no server or network is needed. Checks that
+fetch_status is "completed" only when every section produced its data,
+since rag.py persists only completed records.
+
+Usage:
+    python tests/test_fetch_status.py
+    python -m pytest tests/test_fetch_status.py
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import httpx
+
+from app.external_api import fetch_user_data
+
+
+def _backend(overrides: dict | None = None):
+    """Mock transport handler; ``overrides`` maps a URL path suffix to a
+    handler replacing the default response for that endpoint."""
+    overrides = overrides or {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        for suffix, override in overrides.items():
+            if path.endswith(suffix):
+                return await override(request)
+        if path.endswith("/schemes/get_schemes_by_labor"):
+            return httpx.Response(200, json={"success": True, "data": []})
+        if path.endswith("/user/get-renewal-date"):
+            return httpx.Response(200, json={"success": True, "data": {}})
+        if path.endswith("/user/get-user-registration-details"):
+            return httpx.Response(200, json={"success": True, "data": {}})
+        return httpx.Response(404, json={"success": False})
+
+    return handler
+
+
+async def _fetch(overrides: dict | None = None) -> dict:
+    transport = httpx.MockTransport(_backend(overrides))
+    async with httpx.AsyncClient(transport=transport) as client:
+        return await fetch_user_data(client, "1001", "test-token")
+
+
+def test_all_sections_completed():
+    data = asyncio.run(_fetch())
+    assert data["fetch_status"] == "completed", data
+    assert not [k for k in data if k.endswith("_error")], data
+
+
+def test_errored_section_is_partial():
+    async def fail(request):
+        return httpx.Response(500, text="Internal Server Error")
+
+    data = asyncio.run(_fetch({"/user/get-renewal-date": fail}))
+    assert "renewal_date_error" in data, data
+    assert data["fetch_status"] == "partial", data
+
+
+def test_cancelled_section_without_deadline_is_partial():
+    # The section is cancelled on its own, well before EXTERNAL_API_TIMEOUT
+    async def cancel(request):
+        raise asyncio.CancelledError
+
+    data = asyncio.run(_fetch({"/schemes/get_schemes_by_labor": cancel}))
+    assert data["schemes_error"] == "Cancelled", data
+    assert data["fetch_status"] == "partial", data
+
+
+def main():
+    tests = [
+        test_all_sections_completed,
+        test_errored_section_is_partial,
+        test_cancelled_section_without_deadline_is_partial,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"  FAIL: {test.__name__}")
+            print(f"    {json.dumps(str(e))[:500]}")
+        else:
+            print(f"  PASS: {test.__name__}")
+    print(f"{len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())